@@ -1,18 +1,50 @@
 import math                     # math functions like log() and sqrt()
+import heapq                    # heapq.nlargest/nsmallest for top-n selection
 import random                   # random.sample
+import re                       # precompiled case-insensitive search
+from collections import Counter  # counting repos per language
 import time                     # time.perf_counter() for timing comparisons
 from datetime import datetime, timezone  # datetime parsing and UTC time
+from functools import lru_cache  # memoize repeated timestamp parsing
 import numpy as np              # NumPy for arrays and mean()
+from analytics_kernels import SUMMARY_FIELDS, summarize  # compiled/NumPy summary reductions
 
+# Numeric GitHub fields that enrich_repos() normalizes to plain ints
+# (the counts every repo row needs; "size" is left alone, so a repo without it
+# doesn't get a made-up size of 0)
+_INT_FIELDS = ("stargazers_count", "forks_count", "open_issues_count")
 
+# Stand-in for "no push date" inside int64 arrays (larger than any real day count)
+_DAYS_MISSING = np.iinfo(np.int64).max
+
+
+@lru_cache(maxsize=4096)
 def _parse_github_datetime(dt_str):
     """
     GitHub timestamps look like: '2024-01-01T12:34:56Z'
     Convert that string into a Python datetime object.
     Return None if dt_str is missing or invalid.
+
+    Results are memoized by the raw string: many repos share the same
+    timestamps, and a dict lookup is much cheaper than re-parsing.
+    datetime objects are immutable, so sharing them is safe.
     """
     if not dt_str:
         return None
+
+    # Fast path: GitHub always uses the exact 20-char "YYYY-MM-DDTHH:MM:SSZ"
+    # layout, so I can slice the numbers out directly instead of running the
+    # general ISO parser (and building a "+00:00" copy of the string).
+    if len(dt_str) == 20 and dt_str[-1] == "Z" and dt_str[4] == "-" and dt_str[10] == "T":
+        try:
+            return datetime(
+                int(dt_str[0:4]), int(dt_str[5:7]), int(dt_str[8:10]),
+                int(dt_str[11:13]), int(dt_str[14:16]), int(dt_str[17:19]),
+                tzinfo=timezone.utc,
+            )
+        except ValueError:
+            pass  # not really that layout; let fromisoformat decide below
+
     try:
         # fromisoformat doesn't understand "Z", so we replace it with "+00:00"
         return datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
@@ -20,25 +52,72 @@ def _parse_github_datetime(dt_str):
         return None
 
 
-def _days_since(dt):
+def _days_since(dt, now=None):
     """
     Return integer days since datetime dt.
     If dt is None, return None.
+
+    now is optional so loops can compute the current time once and pass it
+    in, instead of asking the clock again for every repo.
     """
     if dt is None:
         return None
 
-    # Get current time in UTC
-    now = datetime.now(timezone.utc)
+    # Get current time in UTC (only if the caller didn't give us one)
+    if now is None:
+        now = datetime.now(timezone.utc)
 
-    # Convert dt to UTC and subtract
-    delta = now - dt.astimezone(timezone.utc)
+    # Subtract POSIX timestamps (already UTC, no timezone conversion needed)
+    delta_seconds = now.timestamp() - dt.timestamp()
 
     # Convert seconds into whole days (floor division)
-    return int(delta.total_seconds() // 86400)
+    return int(delta_seconds // 86400)
+
 
+def _pushed_at_array(repos):
+    """
+    Parse every repo's pushed_at into one datetime64[s] array (NaT if missing).
 
-def enrich_repos(repos):
+    Instead of parsing each pushed_at string in Python, I hand the whole
+    list to NumPy, which parses ISO-8601 dates natively in one C call.
+    Returns None if NumPy can't parse one of the strings.
+    """
+    # NumPy's datetime64 has no timezones, so strip GitHub's trailing "Z"
+    # (every GitHub timestamp is already UTC). None/"" become NaT.
+    pushed = [(r.get("pushed_at") or "").rstrip("Z") or None for r in repos]
+
+    try:
+        return np.array(pushed, dtype="datetime64[s]")
+    except ValueError:
+        return None
+
+
+def _days_since_push_array(repos, now=None, pushed_arr=None):
+    """
+    Return an int64 NumPy array with days since last push for every repo.
+
+    pushed_arr is an optional _pushed_at_array(repos) the caller already has.
+    Missing dates become _DAYS_MISSING so they sort/compare as "very old".
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+
+    if pushed_arr is None:
+        pushed_arr = _pushed_at_array(repos)
+
+    if pushed_arr is None:
+        # Some string NumPy can't parse: fall back to the per-repo parser.
+        days = [_days_since(_parse_github_datetime(r.get("pushed_at")), now) for r in repos]
+        return np.array([_DAYS_MISSING if d is None else d for d in days], dtype=np.int64)
+
+    now64 = np.datetime64(int(now.timestamp()), "s")
+    seconds = (now64 - pushed_arr).astype(np.int64)
+
+    # Floor division to whole days, then put the sentinel back for missing dates
+    return np.where(np.isnat(pushed_arr), _DAYS_MISSING, seconds // 86400)
+
+
+def enrich_repos(repos, inplace=False):
     """
     Add derived fields to each repo dictionary.
 
@@ -47,22 +126,59 @@ def enrich_repos(repos):
       - days_since_push: integer days since last push
       - is_active_30 / 90 / 365: boolean activity flags
 
-    We copy each repo dict so we do not mutate the original list.
+    It also normalizes the count fields (stars, forks, issues) to ints.
+
+    By default we copy each repo dict so we do not mutate the original list.
+    If the caller is about to throw the raw list away anyway (e.g. right
+    after a fetch), inplace=True skips the copies and adds the fields to
+    the original dicts.
+
+    If every repo is already enriched (has days_since_push), I skip the
+    date work, so calling this twice in a pipeline doesn't redo it; the
+    result is still a list of copies unless inplace=True.
     """
-    enriched = []
+    if repos and all("days_since_push" in r for r in repos):
+        return repos if inplace else [dict(r) for r in repos]
 
-    for r in repos:
-        pushed_dt = _parse_github_datetime(r.get("pushed_at"))
-        days = _days_since(pushed_dt)
+    enriched = []
 
-        new_r = dict(r)  # copy
-        new_r["pushed_dt"] = pushed_dt
-        new_r["days_since_push"] = days
+    # Read the clock once for the whole list (it doesn't change per repo)
+    now = datetime.now(timezone.utc)
 
-        # Activity flags (True if pushed within the window)
-        new_r["is_active_30"] = (days is not None and days <= 30)
-        new_r["is_active_90"] = (days is not None and days <= 90)
-        new_r["is_active_365"] = (days is not None and days <= 365)
+    # Parse every pushed_at once, then reuse that array for both the ages
+    # and the pushed_dt values (no second parse per repo).
+    pushed_arr = _pushed_at_array(repos)
+    days_arr = _days_since_push_array(repos, now, pushed_arr)
+
+    if pushed_arr is not None:
+        # datetime64 -> naive datetime (NaT -> None); the values are UTC.
+        pushed_dts = [
+            None if d is None else d.replace(tzinfo=timezone.utc)
+            for d in pushed_arr.astype(object).tolist()
+        ]
+    else:
+        pushed_dts = [_parse_github_datetime(r.get("pushed_at")) for r in repos]
+
+    # Activity flags (True if pushed within the window), computed as three
+    # whole-array comparisons. Missing dates hold the _DAYS_MISSING sentinel,
+    # which is bigger than every window, so no separate None check is needed.
+    active_30 = (days_arr <= 30).tolist()
+    active_90 = (days_arr <= 90).tolist()
+    active_365 = (days_arr <= 365).tolist()
+
+    for i, (r, days) in enumerate(zip(repos, days_arr.tolist())):
+        new_r = r if inplace else dict(r)  # copy unless told otherwise
+        new_r["pushed_dt"] = pushed_dts[i]
+        new_r["days_since_push"] = None if days == _DAYS_MISSING else days
+
+        new_r["is_active_30"] = active_30[i]
+        new_r["is_active_90"] = active_90[i]
+        new_r["is_active_365"] = active_365[i]
+
+        # Coerce the count fields to int once here, so downstream code can
+        # read them directly instead of wrapping every access in int(...).
+        for field in _INT_FIELDS:
+            new_r[field] = int(new_r.get(field) or 0)
 
         enriched.append(new_r)
 
@@ -98,134 +214,131 @@ def compute_summary(repos):
             "total_open_issues": 0
         }
 
-    repos = enrich_repos(repos)
-
-    stars = []
-    total_stars = 0
-
-    active_30d = 0
-    active_90d = 0
-    active_365d = 0
-    stale_365d_plus = 0
-
-    archived_count = 0
-    licensed_count = 0
-
-    repos_with_issues = 0
-    total_open_issues = 0
-
-    for r in repos:
-        # Stars
-        s = int(r.get("stargazers_count", 0))
-        stars.append(s)
-        total_stars += s
-
-        # Activity flags
-        if r.get("is_active_30"):
-            active_30d += 1
-        if r.get("is_active_90"):
-            active_90d += 1
-        if r.get("is_active_365"):
-            active_365d += 1
-
-        # Stale logic: missing pushed date OR > 365 days ago
-        d = r.get("days_since_push")
-        if d is None or d > 365:
-            stale_365d_plus += 1
-
-        # Archived flag
-        if bool(r.get("archived", False)):
-            archived_count += 1
-
-        # License: usually dict or None
-        if r.get("license") is not None:
-            licensed_count += 1
-
-        # Issues
-        issues = int(r.get("open_issues_count", 0))
-        total_open_issues += issues
-        if issues > 0:
-            repos_with_issues += 1
-
+    # No enrich_repos() here: the summary only needs one number per repo
+    # (days since push), so building a full list of copied dicts just to
+    # loop over it once would be wasted work.
     repo_count = len(repos)
+
+    # Build one NumPy array per numeric field ("structure of arrays").
+    # Each array is built once, then every stat below is a fast C-level
+    # reduction instead of a Python += inside a loop.
+    stars = np.fromiter(
+        (r.get("stargazers_count") or 0 for r in repos), dtype=np.int64, count=repo_count
+    )
+    issues = np.fromiter(
+        (r.get("open_issues_count") or 0 for r in repos), dtype=np.int64, count=repo_count
+    )
+    # Missing push dates become a huge sentinel so they count as "old".
+    if all("days_since_push" in r for r in repos):
+        # Caller already enriched the whole list, so reuse those numbers.
+        days = np.fromiter(
+            (_DAYS_MISSING if r.get("days_since_push") is None else r["days_since_push"] for r in repos),
+            dtype=np.int64,
+            count=repo_count,
+        )
+    else:
+        days = _days_since_push_array(repos)
+
+    # Stars, activity windows, stale count and issues all come from one kernel
+    # call (see analytics_kernels.py). Missing push dates are the sentinel,
+    # so they land in "stale" and never in an "active" window.
+    stats = dict(zip(SUMMARY_FIELDS, summarize(stars, days, issues).tolist()))
+
+    # Archived flag and license (usually dict or None) as boolean arrays,
+    # so counting them is a single .sum() instead of an if + += per repo.
+    archived = np.fromiter((bool(r.get("archived", False)) for r in repos), dtype=bool, count=repo_count)
+    licensed = np.fromiter((r.get("license") is not None for r in repos), dtype=bool, count=repo_count)
+
+    archived_count = int(archived.sum())
+    licensed_count = int(licensed.sum())
+
+    total_stars = stats["total_stars"]
     avg_stars = total_stars / repo_count if repo_count else 0
-    min_stars = min(stars) if stars else 0
-    max_stars = max(stars) if stars else 0
 
     return {
         "repo_count": repo_count,
         "total_stars": total_stars,
         "avg_stars": avg_stars,
-        "min_stars": min_stars,
-        "max_stars": max_stars,
-        "active_30d": active_30d,
-        "active_90d": active_90d,
-        "active_365d": active_365d,
-        "stale_365d_plus": stale_365d_plus,
+        "min_stars": stats["min_stars"],
+        "max_stars": stats["max_stars"],
+        "active_30d": stats["active_30d"],
+        "active_90d": stats["active_90d"],
+        "active_365d": stats["active_365d"],
+        "stale_365d_plus": stats["stale_365d_plus"],
         "archived_count": archived_count,
         "licensed_count": licensed_count,
-        "repos_with_issues": repos_with_issues,
-        "total_open_issues": total_open_issues
+        "repos_with_issues": stats["repos_with_issues"],
+        "total_open_issues": stats["total_open_issues"]
     }
 
 
+def _top_n_by_keys(repos, keys, n, largest=True):
+    """
+    Return the n repos with the largest (or smallest) precomputed keys.
+
+    "Decorate-sort-undecorate": each key is computed once up front, so the
+    heap only compares plain ints instead of calling a lambda + .get() +
+    int() on every comparison. Ties keep their original order.
+    """
+    pick = heapq.nlargest if largest else heapq.nsmallest
+    idx = pick(n, range(len(repos)), key=keys.__getitem__)
+    return [repos[i] for i in idx]
+
+
 def top_repos_by_stars(repos, n=10):
-    """Sort repos by stars descending and return top n."""
-    return sorted(repos, key=lambda r: int(r.get("stargazers_count", 0)), reverse=True)[:n]
+    """
+    Return the top n repos by stars (descending).
+
+    heapq.nlargest only keeps n items around, so this is O(N log n)
+    instead of sorting the whole list when n is small (default 10).
+    """
+    keys = [int(r.get("stargazers_count", 0)) for r in repos]
+    return _top_n_by_keys(repos, keys, n)
 
 
 def top_repos_by_forks(repos, n=10):
-    """Sort repos by forks descending and return top n."""
-    return sorted(repos, key=lambda r: int(r.get("forks_count", 0)), reverse=True)[:n]
+    """Return the top n repos by forks (descending), using a heap like above."""
+    keys = [int(r.get("forks_count", 0)) for r in repos]
+    return _top_n_by_keys(repos, keys, n)
 
 
 def top_repos_by_recent_push(repos, n=10):
     """
-    Sort repos by most recent push (smallest days_since_push).
-    We enrich repos so we can access days_since_push.
+    Return the n most recently pushed repos (newest first).
+
+    GitHub's ISO-8601 timestamps sort alphabetically in the same order as
+    the dates they represent, so I rank on the raw pushed_at strings with
+    no date parsing at all. Missing dates become "" (sorts as oldest).
+    Only the n winners get enriched, so callers still see days_since_push.
     """
-    enriched = enrich_repos(repos)
-    # Treat None as very old by using a huge number
-    return sorted(
-        enriched,
-        key=lambda r: r["days_since_push"] if r["days_since_push"] is not None else 10**9
-    )[:n]
+    keys = [r.get("pushed_at") or "" for r in repos]
+    return enrich_repos(_top_n_by_keys(repos, keys, n))
 
 
 def top_languages(repos, n=10):
     """
     Count repos per language and return top n.
     Demonstrates dictionary aggregation.
-    """
-    counts = {}
 
-    for r in repos:
-        lang = r.get("language")
-        if lang is None:
-            continue
-
-        # Initialize if missing
-        if lang not in counts:
-            counts[lang] = 0
-
-        # Increment count (augmented assignment)
-        counts[lang] += 1
+    collections.Counter is a dict subclass built for exactly this kind of
+    counting, and most_common(n) picks the top n with a heap (no full sort).
+    """
+    counts = Counter(r.get("language") for r in repos if r.get("language") is not None)
 
-    rows = [{"language": lang, "repo_count": counts[lang]} for lang in counts]
-    return sorted(rows, key=lambda x: x["repo_count"], reverse=True)[:n]
+    return [{"language": lang, "repo_count": c} for lang, c in counts.most_common(n)]
 
 
 def search_repos(repos, keyword):
-    """Search repos by name (case-insensitive)."""
-    keyword = keyword.strip().lower()
-    matches = []
+    """
+    Search repos by name (case-insensitive).
 
-    for r in repos:
-        name = str(r.get("name", "")).lower()
-        if keyword in name:
-            matches.append(r)
+    I compile the keyword into a case-insensitive regex once, so the loop
+    doesn't have to build a lowercased copy of every repo name.
+    re.escape makes characters like "." or "+" match literally.
+    """
+    pattern = re.compile(re.escape(keyword.strip()), re.IGNORECASE)
 
-    return matches
+    return [r for r in repos if pattern.search(str(r.get("name", "")))]
 
 
 def repo_score(repo):
@@ -238,6 +351,22 @@ def repo_score(repo):
     return math.log(stars + 1) * 2 + math.sqrt(forks + 1)
 
 
+def repo_scores(repos):
+    """
+    Batch version of repo_score() for many repos at once.
+
+    Returns a NumPy array of scores (same order as repos).
+    np.log1p / np.sqrt run over whole arrays in C, which is much faster
+    than calling math.log and math.sqrt once per repo.
+    """
+    count = len(repos)
+    stars = np.fromiter((r.get("stargazers_count") or 0 for r in repos), dtype=np.int64, count=count)
+    forks = np.fromiter((r.get("forks_count") or 0 for r in repos), dtype=np.int64, count=count)
+
+    # Same formula as repo_score: log(stars + 1) * 2 + sqrt(forks + 1)
+    return np.log1p(stars) * 2.0 + np.sqrt(forks + 1)
+
+
 def random_spotlight(repos, k=5):
     """Pick k random repos or return all if fewer than k."""
     if len(repos) <= k:
@@ -245,44 +374,104 @@ def random_spotlight(repos, k=5):
     return random.sample(repos, k)
 
 
+def _loop_mean(a):
+    """Plain for-loop mean over a float64 array (Numba compiles this, see below)."""
+    n = a.shape[0]
+    if n == 0:
+        return 0.0
+    total = 0.0
+    for i in range(n):
+        total += a[i]
+    return total / n
+
+
+@lru_cache(maxsize=1)
+def _get_jit_mean():
+    """
+    Return _loop_mean compiled by Numba, or None if numba isn't installed.
+
+    Numba is optional and only numpy_speed_test() uses it, so I import and
+    compile it here, the first time the speed test runs, instead of at module
+    import (which every Streamlit rerun and CLI start would pay for).
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+
+    jit_mean = njit(cache=True)(_loop_mean)
+
+    # Compile once now, so the timed call in numpy_speed_test measures the
+    # loop itself and not Numba's one-time compile cost.
+    jit_mean(np.zeros(1, dtype=np.float64))
+    return jit_mean
+
+
 def numpy_speed_test(stars_list):
     """
     Compare loop mean vs NumPy mean + timing.
     Returns means and how long each method took.
+
+    stars_list can be a Python list or a NumPy array (main.py builds an int64
+    array with np.fromiter). The loop is always timed over plain Python ints,
+    so the comparison stays loop-vs-NumPy and not "loop over NumPy scalars".
+
+    If Numba is installed, a third method (the same loop, JIT-compiled)
+    is timed too. Otherwise numba_mean / numba_seconds are None.
     """
+    n = len(stars_list)  # (an array has no single truth value, so no "if stars_list")
+    loop_values = stars_list.tolist() if isinstance(stars_list, np.ndarray) else stars_list
+
     # Loop timing
     start_loop = time.perf_counter()
 
     total = 0
-    for s in stars_list:
+    for s in loop_values:
         total += s
 
-    loop_mean = total / len(stars_list) if stars_list else 0
+    loop_mean = total / n if n else 0
     loop_seconds = time.perf_counter() - start_loop
 
     # NumPy timing
     start_np = time.perf_counter()
 
-    arr = np.array(stars_list, dtype=float)
-    numpy_mean = float(arr.mean()) if stars_list else 0
+    arr = np.asarray(stars_list, dtype=float)
+    numpy_mean = float(arr.mean()) if n else 0
 
     numpy_seconds = time.perf_counter() - start_np
 
+    # Numba timing (only if available). Numba can't speed up a Python list,
+    # so the data is converted to an array first, like the NumPy branch.
+    numba_mean = None
+    numba_seconds = None
+    jit_mean = _get_jit_mean()  # imports + compiles on first use (not timed)
+    if jit_mean is not None:
+        start_jit = time.perf_counter()
+
+        jit_arr = np.asarray(stars_list, dtype=np.float64)
+        numba_mean = float(jit_mean(jit_arr))
+
+        numba_seconds = time.perf_counter() - start_jit
+
     return {
         "loop_mean": loop_mean,
         "numpy_mean": numpy_mean,
+        "numba_mean": numba_mean,
         "loop_seconds": loop_seconds,
-        "numpy_seconds": numpy_seconds
+        "numpy_seconds": numpy_seconds,
+        "numba_seconds": numba_seconds
     }
 
 
-def build_repo_rows(repos, username):
+def iter_repo_rows(repos, username, enriched=None):
     """
-    Convert GitHub repo dicts into simple row dicts for CSV/SQLite.
-    This is a classic "transform" step (API -> clean rows).
+    Generator version of build_repo_rows(): yields one row dict at a time.
+
+    A streaming consumer (like the CSV writer) can write each row as it is
+    produced, so only one row has to be in memory at once.
     """
-    enriched = enrich_repos(repos)
-    rows = []
+    if enriched is None:
+        enriched = enrich_repos(repos)
 
     for r in enriched:
         # License can be a dict or None
@@ -291,17 +480,18 @@ def build_repo_rows(repos, username):
         if isinstance(license_obj, dict):
             license_name = license_obj.get("name")
 
-        rows.append({
+        yield {
             "username": username,
             "repo_id": r.get("id"),
             "name": r.get("name"),
             "full_name": r.get("full_name"),
             "html_url": r.get("html_url"),
             "language": r.get("language"),
-            "stargazers_count": int(r.get("stargazers_count", 0)),
-            "forks_count": int(r.get("forks_count", 0)),
-            "open_issues_count": int(r.get("open_issues_count", 0)),
-            "size_kb": int(r.get("size", 0)),
+            # Counts were already coerced to int by enrich_repos()
+            "stargazers_count": r["stargazers_count"],
+            "forks_count": r["forks_count"],
+            "open_issues_count": r["open_issues_count"],
+            "size_kb": int(r.get("size") or 0),
             "archived": bool(r.get("archived", False)),
             "license_name": license_name,
             "created_at": r.get("created_at"),
@@ -311,6 +501,18 @@ def build_repo_rows(repos, username):
             "is_active_30": bool(r.get("is_active_30")),
             "is_active_90": bool(r.get("is_active_90")),
             "is_active_365": bool(r.get("is_active_365"))
-        })
+        }
+
 
-    return rows
\ No newline at end of file
+def build_repo_rows(repos, username, enriched=None):
+    """
+    Convert GitHub repo dicts into simple row dicts for CSV/SQLite.
+    This is a classic "transform" step (API -> clean rows).
+
+    enriched is optional: if the caller already ran enrich_repos(repos),
+    pass the result in so we don't parse every date a second time.
+
+    Returns a list (the UI and DB code index into it more than once);
+    use iter_repo_rows() when a single streaming pass is enough.
+    """
+    return list(iter_repo_rows(repos, username, enriched=enriched))
\ No newline at end of file
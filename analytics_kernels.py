@@ -0,0 +1,140 @@
+# analytics_kernels.py
+#
+# Purpose:
+# This file holds the numeric "kernel" behind compute_summary() in analytics.py:
+# the star / activity / issue reductions over whole NumPy arrays.
+#
+# Why it is its own file:
+# - The kernel can be compiled ahead of time (AOT) into a native extension with
+#   Numba, so a deployed app gets compiled speed on the very first request
+#   (no JIT compile pause, and Numba doesn't even need to be installed to use it).
+# - If the compiled extension isn't there, I fall back to plain NumPy, so the
+#   app works the same either way.
+#
+# How to build the compiled version (optional, needs numba + a C compiler):
+#   python analytics_kernels.py
+# This writes _analytics_kernels_aot.<platform>.so next to this file.
+
+import os
+import numpy as np
+
+# Name of the compiled extension module (must differ from this file's name).
+_AOT_MODULE = "_analytics_kernels_aot"
+
+# Order of the values returned by summarize().
+SUMMARY_FIELDS = (
+    "total_stars",
+    "min_stars",
+    "max_stars",
+    "active_30d",
+    "active_90d",
+    "active_365d",
+    "stale_365d_plus",
+    "total_open_issues",
+    "repos_with_issues",
+)
+
+
+def _summarize_loop(stars, days, issues):
+    """
+    Single-pass loop version of the summary reductions.
+
+    This is the source Numba compiles ahead of time. Written as a plain loop
+    (one pass, no temporary arrays) because that's what compiles best.
+    Inputs are int64 arrays of the same length; missing push dates must
+    already be a huge sentinel value in days.
+    """
+    out = np.zeros(9, dtype=np.int64)
+    n = stars.shape[0]
+    if n == 0:
+        return out
+
+    min_s = stars[0]
+    max_s = stars[0]
+
+    for i in range(n):
+        s = stars[i]
+        out[0] += s
+        if s < min_s:
+            min_s = s
+        if s > max_s:
+            max_s = s
+
+        d = days[i]
+        if d <= 30:
+            out[3] += 1
+        if d <= 90:
+            out[4] += 1
+        if d <= 365:
+            out[5] += 1
+        else:
+            out[6] += 1
+
+        k = issues[i]
+        out[7] += k
+        if k > 0:
+            out[8] += 1
+
+    out[1] = min_s
+    out[2] = max_s
+    return out
+
+
+def _summarize_numpy(stars, days, issues):
+    """
+    NumPy fallback used when the compiled extension isn't available.
+    Same outputs as _summarize_loop, using vectorized reductions.
+    """
+    if stars.shape[0] == 0:
+        return np.zeros(9, dtype=np.int64)
+
+    return np.array([
+        stars.sum(),
+        stars.min(),
+        stars.max(),
+        (days <= 30).sum(),
+        (days <= 90).sum(),
+        (days <= 365).sum(),
+        (days > 365).sum(),
+        issues.sum(),
+        (issues > 0).sum(),
+    ], dtype=np.int64)
+
+
+# Prefer the ahead-of-time compiled kernel if someone built it.
+try:
+    from _analytics_kernels_aot import summarize as _summarize_aot
+except ImportError:
+    _summarize_aot = None
+
+
+def summarize(stars, days, issues):
+    """
+    Compute the summary reductions for three int64 arrays.
+
+    Returns an int64 array whose values line up with SUMMARY_FIELDS.
+    """
+    stars = np.ascontiguousarray(stars, dtype=np.int64)
+    days = np.ascontiguousarray(days, dtype=np.int64)
+    issues = np.ascontiguousarray(issues, dtype=np.int64)
+
+    if _summarize_aot is not None:
+        return _summarize_aot(stars, days, issues)
+    return _summarize_numpy(stars, days, issues)
+
+
+def build():
+    """
+    Compile _summarize_loop into a native extension with Numba's AOT compiler.
+    Only needed at deploy/build time, never at runtime.
+    """
+    from numba.pycc import CC
+
+    cc = CC(_AOT_MODULE)
+    cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+    cc.export("summarize", "i8[:](i8[:], i8[:], i8[:])")(_summarize_loop)
+    cc.compile()
+
+
+if __name__ == "__main__":
+    build()
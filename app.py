@@ -13,6 +13,10 @@
 import os                     # Used for file paths and opening generated files (like PDFs)
 import shutil                 # Used to delete directories (clearing caches)
 import base64                 # Used to embed an SVG logo into the page as a base64 data URI
+import html                   # Escape text before putting it into static HTML tables
+import time                   # Used to bucket the GitHub fetch cache by time (expiry)
+import hashlib                # Fingerprint of fetched repos for the cached views
+from concurrent.futures import ThreadPoolExecutor, as_completed  # Score several repos in parallel
 import streamlit as st        # Streamlit is the UI framework for the project
 import pandas as pd           # Pandas makes it easy to display tables and build chart-ready data
 
@@ -24,19 +28,35 @@ import pandas as pd           # Pandas makes it easy to display tables and build
 # - cache_utils.py: caching layer so we don't waste free quota
 # - db_utils.py: SQLite persistence for "history"
 # - report_utils.py: PDF export
+#
+# llm_utils (Groq SDK) and report_utils (ReportLab) are heavy to import and only
+# needed when a button is clicked, so I import them inside those handlers instead.
+# That keeps the first page load fast for someone who only looks at the dashboard.
 from github_api import fetch_repos, fetch_repo_sample
-from analytics import compute_summary, top_languages, build_repo_rows
-from scoring import combined_repo_score, average_scores, confidence_score
-from llm_utils import analyze_repo_quality_with_llm, analyze_portfolio_summary
-from cache_utils import cache_get, cache_set, make_llm_cache_key
+from analytics import compute_summary, top_languages, build_repo_rows, enrich_repos
+from scoring import (
+    combined_repo_score,
+    blend_scores,
+    score_many,
+    average_scores,
+    confidence_score,
+    score_matrix,
+)
+from cache_utils import (
+    cache_get,
+    cache_get_many,
+    cache_set,
+    cache_set_many,
+    clear_memory_cache,
+    make_llm_cache_key,
+    make_llm_fast_key,
+)
 from db_utils import (
-    init_db,
     create_run,
-    save_repo_score,
+    save_repo_scores,
     get_recent_runs,
-    get_run_repo_scores,
+    get_run_repo_scores_df,
 )
-from report_utils import export_recruiter_pdf
 
 
 # ----------------------------
@@ -79,6 +99,37 @@ def svg_to_data_uri(svg: str) -> str:
     return f"data:image/svg+xml;base64,{b64}"
 
 
+# Streamlit serves files in ./static at app/static/... when enableStaticServing
+# is on (see .streamlit/config.toml). Pointing <img> at that URL means each rerun
+# sends a short path instead of ~1 KB of base64, and the browser caches the file.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+LOGO_STATIC_URL = "app/static/logo.svg"
+
+
+# The logo never changes, so I do this once per server process
+# instead of on every rerun (every widget click).
+@st.cache_resource
+def _logo_uri():
+    """
+    Write the SVG to static/logo.svg (only if it changed) and return its URL.
+    If the folder isn't writable, fall back to the inline data URI.
+    """
+    svg = repolens_logo_svg()
+    path = os.path.join(STATIC_DIR, "logo.svg")
+    try:
+        current = None
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                current = f.read()
+        if current != svg:
+            os.makedirs(STATIC_DIR, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(svg)
+        return LOGO_STATIC_URL
+    except OSError:
+        return svg_to_data_uri(svg)
+
+
 # ----------------------------
 # Tooltip text (single source of truth)
 # ----------------------------
@@ -99,23 +150,50 @@ TOOLTIPS = {
 # UI helpers
 # ----------------------------
 # These functions help keep UI consistent and avoid duplicated UI code.
+# Color for every whole score 0–100, built once:
+# red below 40, orange 40–59, blue 60–79, green 80+.
+_SCORE_COLORS = ["#EF4444"] * 40 + ["#F59E0B"] * 20 + ["#0EA5E9"] * 20 + ["#22C55E"] * 21
+
+
 def score_color(score):
     """
     Convert a score (0–100) into a color used across the UI.
     I use green/blue/yellow/red for quick interpretation.
+
+    This is called for every badge and bar, so it is just a clamp + list lookup
+    into _SCORE_COLORS instead of a chain of if-checks.
     """
     try:
-        s = float(score)
-    except Exception:
+        return _SCORE_COLORS[max(0, min(100, int(float(score))))]
+    except (TypeError, ValueError, OverflowError):
         return "#94A3B8"  # gray for invalid/unknown values
 
-    if s >= 80:
-        return "#22C55E"  # green
-    if s >= 60:
-        return "#0EA5E9"  # blue
-    if s >= 40:
-        return "#F59E0B"  # orange
-    return "#EF4444"      # red
+
+# The badge / score bar HTML never changes except for a few values, so I keep
+# each one as a single-line template built once, and only fill in the blanks.
+# (Single line = no indentation whitespace sent to the browser.)
+_BADGE_TMPL = (
+    '<span style="display:inline-flex;align-items:center;gap:8px;padding:7px 12px;'
+    'border-radius:999px;border:1px solid #E2E8F0;background:#FFFFFF;font-weight:800;'
+    'color:#0F172A;font-size:13px;">'
+    '<span style="width:10px;height:10px;border-radius:999px;background:{0};"></span>'
+    '<span style="color:#334155;font-weight:800;">{1}:</span>'
+    '<span>{2}</span>'
+    '</span>'
+)
+
+_SCORE_BAR_TMPL = (
+    '<div style="margin:10px 0;">'
+    '<div style="display:flex;justify-content:space-between;align-items:center;">'
+    '<div style="font-weight:900;color:#0F172A;">{0}</div>'
+    '<div style="font-weight:900;color:#0F172A;">{1}</div>'
+    '</div>'
+    '<div style="width:100%;height:12px;background:#F1F5F9;border-radius:999px;'
+    'overflow:hidden;border:1px solid #E2E8F0;">'
+    '<div style="height:12px;width:{1}%;background:{2};border-radius:999px;"></div>'
+    '</div>'
+    '</div>'
+)
 
 
 def render_badge(label, value):
@@ -123,26 +201,8 @@ def render_badge(label, value):
     Render a small pill/badge with a colored dot and a label/value.
     This is used for compact score summaries.
     """
-    color = score_color(value)
     safe_val = value if value is not None else "—"  # avoid showing "None" in the UI
-
-    return f"""
-    <span style="
-        display:inline-flex;
-        align-items:center;
-        gap:8px;
-        padding:7px 12px;
-        border-radius:999px;
-        border:1px solid #E2E8F0;
-        background:#FFFFFF;
-        font-weight:800;
-        color:#0F172A;
-        font-size: 13px;">
-        <span style="width:10px;height:10px;border-radius:999px;background:{color};"></span>
-        <span style="color:#334155; font-weight:800;">{label}:</span>
-        <span>{safe_val}</span>
-    </span>
-    """
+    return _BADGE_TMPL.format(score_color(value), label, safe_val)
 
 
 def render_score_bar(label, value):
@@ -155,31 +215,82 @@ def render_score_bar(label, value):
     except Exception:
         v = 0
 
-    bar_color = score_color(v)
+    # v is already a clamped int, so I index the color table directly
+    return _SCORE_BAR_TMPL.format(label, v, _SCORE_COLORS[v])
 
-    return f"""
-    <div style="margin: 10px 0;">
-        <div style="display:flex; justify-content:space-between; align-items:center;">
-            <div style="font-weight:900; color:#0F172A;">{label}</div>
-            <div style="font-weight:900; color:#0F172A;">{v}</div>
-        </div>
-        <div style="
-            width:100%;
-            height:12px;
-            background:#F1F5F9;
-            border-radius:999px;
-            overflow:hidden;
-            border:1px solid #E2E8F0;
-        ">
-            <div style="
-                height:12px;
-                width:{v}%;
-                background:{bar_color};
-                border-radius:999px;
-            "></div>
-        </div>
-    </div>
+
+# Score columns are 0–100 with one decimal, so a nullable float32 column is plenty
+# (and keeps None as <NA> instead of turning the whole column into objects).
+SCORE_DTYPES = {
+    "Total": "Float32",
+    "LLM Skill": "Float32",
+    "Hard": "Float32",
+    "Activity": "Float32",
+    "Popularity": "Float32",
+    "Health": "Float32",
+}
+
+# Count columns stay whole numbers. With a missing value (None) pandas would make
+# them float64 and the table would show "12.0", so they get a nullable int type.
+COUNT_DTYPES = {
+    "Stars": "Int64",
+    "Forks": "Int64",
+    "Open Issues": "Int64",
+    "Days Since Push": "Int64",
+}
+
+
+def columns_frame(rows, columns):
+    """
+    Build a DataFrame column-by-column from a list of row dicts.
+
+    columns maps source key -> display name. I only pull the columns the table
+    shows, already under their display names, so pandas gets one list per column
+    instead of a list of dicts it has to transpose, subset, and rename.
+    Keys missing from the rows are skipped (prevents KeyError-style surprises).
     """
+    first = rows[0] if rows else {}
+    data = {label: [r.get(key) for r in rows] for key, label in columns.items() if key in first}
+    df = pd.DataFrame(data)
+    dtypes = {**SCORE_DTYPES, **COUNT_DTYPES}
+    return df.astype({k: v for k, v in dtypes.items() if k in df.columns})
+
+
+# Tables smaller than this are sent as plain HTML instead of the interactive grid.
+STATIC_TABLE_MAX_ROWS = 200
+
+
+def render_table(df, link_col="Link"):
+    """
+    Show a read-only table.
+
+    st.dataframe ships an interactive (sortable) grid to the browser on every rerun,
+    which is a lot of payload for a few dozen rows. Small tables are rendered as a
+    static HTML table instead; big ones still get the grid so they stay scrollable.
+    """
+    if len(df) >= STATIC_TABLE_MAX_ROWS:
+        st.dataframe(
+            df,
+            column_config={link_col: st.column_config.LinkColumn(link_col)},
+            use_container_width=True,
+            hide_index=True,
+        )
+        return
+
+    # I format and escape every cell myself (repo names come from GitHub, not from me)
+    # so I can turn the URL column into real <a> links.
+    def cell(v):
+        if v is None or (not isinstance(v, (list, dict)) and pd.isna(v)):
+            return "—"
+        if isinstance(v, float):
+            return f"{v:.1f}"
+        return html.escape(str(v))
+
+    out = pd.DataFrame({col: [cell(v) for v in df[col].tolist()] for col in df.columns})
+    if link_col in out.columns:
+        out[link_col] = out[link_col].map(lambda u: f'<a href="{u}" target="_blank">link</a>' if u != "—" else u)
+
+    st.markdown(out.to_html(escape=False, index=False), unsafe_allow_html=True)
 
 
 # ----------------------------
@@ -205,11 +316,16 @@ header{ visibility: hidden !important; height: 0px !important; }
 # ----------------------------
 # Header
 # ----------------------------
-# I render the logo using a data URI so there are no external image assets needed.
-logo_uri = svg_to_data_uri(repolens_logo_svg())
+# I render the logo from the static URL (or a data URI fallback, see _logo_uri).
+# Both header blocks are static, so I build their HTML once and reuse the strings.
+@st.cache_resource
+def _header_html():
+    """
+    Return (main header HTML, sidebar header HTML), built once per server process.
+    """
+    logo_uri = _logo_uri()
 
-st.markdown(
-    f"""
+    main_html = f"""
 <div style="display:flex; align-items:center; gap:12px; margin-bottom:6px;">
     <img src="{logo_uri}" width="42" height="42" />
     <div>
@@ -221,13 +337,10 @@ st.markdown(
 </div>
 <div style="height:5px;width:100%;background: linear-gradient(90deg, #0EA5E9, #22C55E);
 border-radius:999px;margin-bottom:18px;"></div>
-""",
-    unsafe_allow_html=True,
-)
+"""
 
-# Sidebar logo/title block
-st.sidebar.markdown(
-    f"""
+    # Sidebar logo/title block
+    sidebar_html = f"""
 <div style="display:flex; align-items:center; gap:10px; margin: 10px 0 8px 0;">
   <img src="{logo_uri}" width="34" height="34" />
   <div style="display:flex; flex-direction:column;">
@@ -235,9 +348,13 @@ st.sidebar.markdown(
     <div style="font-size:12px; font-weight:800; margin-top:2px;">GitHub insights</div>
   </div>
 </div>
-""",
-    unsafe_allow_html=True,
-)
+"""
+    return main_html, sidebar_html
+
+
+header_html, sidebar_header_html = _header_html()
+st.markdown(header_html, unsafe_allow_html=True)
+st.sidebar.markdown(sidebar_header_html, unsafe_allow_html=True)
 
 
 # ----------------------------
@@ -252,6 +369,211 @@ LLM_CACHE_DIR = "cache/llm"
 LLM_CACHE_VERSION = "groq_v1"
 
 
+# ----------------------------
+# Batch scoring helper
+# ----------------------------
+# (cache_utils locks its own memory/SQLite layers, so scoring threads can call
+# cache_get/cache_set at the same time without a lock here.)
+def repo_fast_key(username, repo_name, row):
+    """The cheap identity cache key for one repo (None if GitHub gave no pushed_at)."""
+    if not row.get("pushed_at"):
+        return None
+    return make_llm_fast_key(f"{username}/{repo_name}", row.get("pushed_at"), model_name=LLM_CACHE_VERSION)
+
+
+def score_repo(username, repo_name, row, use_llm_cache, llm_cache_minutes, prefetched=None, hard_parts=None):
+    """
+    Score ONE repo for the batch run: fetch sample -> LLM (or cache) -> combined score.
+
+    This runs inside a worker thread, so it must not call any st.* functions.
+    prefetched is an optional {fast_key: cached result or None} from
+    cache_get_many, so the batch can look up every fast key in one go.
+    hard_parts is this repo's (activity, popularity, health, ...) row from
+    score_many, so the metadata scores for the whole batch are computed once.
+    Returns the result dict shown in the tables and saved to SQLite.
+    """
+    # Fast path: if the repo hasn't been pushed since it was last scored, the
+    # identity key (name + pushed_at) hits and I skip downloading the sample.
+    fast_key = repo_fast_key(username, repo_name, row) if use_llm_cache else None
+    cached = None
+    if fast_key:
+        if prefetched is not None:
+            cached = prefetched.get(fast_key)
+        else:
+            cached = cache_get(LLM_CACHE_DIR, fast_key, ttl_minutes=llm_cache_minutes)
+
+    if cached is None:
+        readme_text, code_files = fetch_repo_sample(username, repo_name)
+
+        cache_key = make_llm_cache_key(
+            f"{username}/{repo_name}",
+            readme_text,
+            code_files,
+            model_name=LLM_CACHE_VERSION,
+        )
+
+        cached = cache_get(LLM_CACHE_DIR, cache_key, ttl_minutes=llm_cache_minutes) if use_llm_cache else None
+
+        # Content key hit but fast key missed: write the alias so next time is fast.
+        if cached is not None and fast_key:
+            cache_set(LLM_CACHE_DIR, fast_key, cached)
+
+    if cached is not None:
+        llm_result = cached
+    else:
+        from llm_utils import analyze_repo_quality_with_llm  # lazy: see imports note
+
+        # use_cache=False: this function already caches by repo content (above).
+        llm_result, err = analyze_repo_quality_with_llm(
+            repo_full_name=f"{username}/{repo_name}",
+            readme_text=readme_text,
+            code_files=code_files,
+            use_cache=False,
+        )
+
+        # If the LLM fails, I store an error object instead of crashing the batch run.
+        if err:
+            llm_result = {
+                "repo_summary": "",
+                "strengths": [],
+                "weaknesses": [],
+                "suggested_improvements": [],
+                "skill_score": None,
+                "notes": f"LLM error: {err}",
+                "raw_output": "",
+            }
+
+        # Cache even error responses so I don’t spam the provider on repeated runs.
+        # Both keys go in one write (one SQLite transaction).
+        if use_llm_cache and llm_result is not None:
+            entries = {cache_key: llm_result}
+            if fast_key:
+                entries[fast_key] = llm_result
+            cache_set_many(LLM_CACHE_DIR, entries)
+
+    # Combine LLM skill score with hard/activity/popularity/health scores.
+    if hard_parts is not None:
+        combined = blend_scores(*hard_parts[:3], llm_skill_score=llm_result.get("skill_score"))
+    else:
+        combined = combined_repo_score(row, llm_skill_score=llm_result.get("skill_score"))
+
+    # Store both numeric scores and LLM text output for UI.
+    return {
+        "repo": repo_name,
+        "url": row.get("html_url", ""),
+        "language": row.get("language", ""),
+        "total_score": combined.get("total_score"),
+        "llm_skill_score": combined.get("llm_skill_score"),
+        "hard_score": combined.get("hard_score"),
+        "activity_score": combined.get("activity_score"),
+        "popularity_score": combined.get("popularity_score"),
+        "health_score": combined.get("health_score"),
+        "strengths": llm_result.get("strengths", []),
+        "weaknesses": llm_result.get("weaknesses", []),
+        "notes": llm_result.get("notes", ""),
+    }
+
+
+# ----------------------------
+# Cached GitHub fetch
+# ----------------------------
+# Streamlit's own data cache (persisted to disk) replaces the JSON-file cache in
+# github_api for the UI, and it is shared by every session on this server.
+# Streamlit ignores ttl= when persist="disk", so I put the expiry into the key:
+# ttl_bucket changes every cache_minutes, which makes older entries miss.
+@st.cache_data(persist="disk", max_entries=64, show_spinner=False)
+def _fetch_repos_cached(username, per_page, max_pages, ttl_bucket):
+    return fetch_repos(username, per_page=per_page, max_pages=max_pages, use_cache=False)
+
+
+def fetch_repos_for_ui(username, per_page, max_pages, use_cache, cache_minutes):
+    """
+    Fetch repos for the Streamlit UI, through Streamlit's cache when use_cache is on.
+    An empty result (bad username / rate limit) is never cached.
+    """
+    if not use_cache:
+        return fetch_repos(username, per_page=per_page, max_pages=max_pages, use_cache=False)
+
+    ttl_bucket = int(time.time() // (cache_minutes * 60))
+    repos = _fetch_repos_cached(username, per_page, max_pages, ttl_bucket)
+    if not repos:
+        _fetch_repos_cached.clear(username, per_page, max_pages, ttl_bucket)
+    return repos
+
+
+# ----------------------------
+# Cached views
+# ----------------------------
+# Every widget click re-runs this whole script, but the fetched repos only change
+# when "Fetch Repos" is clicked. So I cache the per-tab work with st.cache_data,
+# keyed on a fingerprint of the fetch instead of letting Streamlit hash every repo dict.
+# (Arguments starting with "_" are skipped by Streamlit's hasher.)
+
+# Every repo field the cached views below actually show or count. If any of
+# them changes between fetches (a new star, an issue closed, a repo archived,
+# a license added, one more day since the last push), the fingerprint changes too.
+_FINGERPRINT_FIELDS = (
+    "name",
+    "html_url",
+    "language",
+    "stargazers_count",
+    "forks_count",
+    "open_issues_count",
+    "archived",
+    "license",
+    "pushed_at",
+    "days_since_push",
+)
+
+
+def repos_fingerprint(username, repos):
+    """
+    Identity for one fetch: a 16-byte BLAKE2b hash of the rendered fields of
+    every repo (see _FINGERPRINT_FIELDS), plus the username.
+
+    It is computed once per fetch (not per rerun), and it depends only on the
+    data, so two sessions that fetched identical repos can share the cached
+    views, while any change in what's displayed gets a fresh entry.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for r in repos or []:
+        h.update(repr(tuple(r.get(f) for f in _FINGERPRINT_FIELDS)).encode("utf-8"))
+    return (username, len(repos or []), h.hexdigest())
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_summary(repos_key, _repos):
+    """compute_summary(), computed once per fetch."""
+    return compute_summary(_repos)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_top_languages(repos_key, _repos, n=25):
+    """top_languages(), computed once per fetch."""
+    return top_languages(_repos, n=n)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_explorer_df(repos_key, _repo_rows):
+    """
+    Build the Repo Explorer table once per fetch:
+    only the columns useful in an explorer table, already under display names.
+    """
+    return columns_frame(
+        _repo_rows,
+        {
+            "name": "Repo",
+            "html_url": "Link",
+            "language": "Language",
+            "stargazers_count": "Stars",
+            "forks_count": "Forks",
+            "open_issues_count": "Open Issues",
+            "days_since_push": "Days Since Push",
+            "archived": "Archived",
+        },
+    )
+
+
 # ----------------------------
 # Session state
 # ----------------------------
@@ -261,10 +583,16 @@ if "repos" not in st.session_state:
     st.session_state["repos"] = None
 if "repo_rows" not in st.session_state:
     st.session_state["repo_rows"] = None
+if "row_by_name" not in st.session_state:
+    st.session_state["row_by_name"] = {}
 if "username" not in st.session_state:
     st.session_state["username"] = ""
+if "repos_key" not in st.session_state:
+    st.session_state["repos_key"] = None
 if "scores" not in st.session_state:
     st.session_state["scores"] = []
+if "score_matrix" not in st.session_state:
+    st.session_state["score_matrix"] = None
 if "portfolio_summary" not in st.session_state:
     st.session_state["portfolio_summary"] = None
 if "last_run_id" not in st.session_state:
@@ -310,11 +638,15 @@ score_btn = st.sidebar.button("Run Batch LLM Scoring", type="primary")
 # Clear LLM cache directory and reset related UI state.
 if clear_llm_cache_btn:
     try:
+        # First: forget in-memory copies and close the open cache.sqlite
+        # connections (Windows can't delete a SQLite file that is still open).
+        clear_memory_cache()
         if os.path.exists(LLM_CACHE_DIR):
             shutil.rmtree(LLM_CACHE_DIR)            # delete entire cache folder
         os.makedirs(LLM_CACHE_DIR, exist_ok=True)   # recreate folder
         st.sidebar.success("Cleared LLM cache.")
         st.session_state["scores"] = []
+        st.session_state["score_matrix"] = None
         st.session_state["portfolio_summary"] = None
     except Exception as e:
         st.sidebar.error(f"Failed to clear LLM cache: {repr(e)}")
@@ -332,13 +664,12 @@ if fetch_btn:
     st.session_state["username"] = username_input
 
     with st.spinner("Fetching repositories..."):
-        repos = fetch_repos(
+        repos = fetch_repos_for_ui(
             username_input,
             per_page=100,
             max_pages=int(max_pages),
             use_cache=use_cache,
             cache_minutes=int(cache_minutes),
-            cache_dir="cache",
         )
 
     # If no repos are returned, show error and stop.
@@ -346,14 +677,27 @@ if fetch_btn:
         st.error("No repos returned. Check the username, or you may be rate limited.")
         st.stop()
 
+    # Enrich once here (parse dates, activity flags). The enriched dicts still have
+    # every original GitHub field, so I store them as "repos" and every tab reuses
+    # them; compute_summary() sees they are already enriched and skips that step.
+    # The raw list isn't used anywhere else, so I enrich in place (no dict copies).
+    enriched = enrich_repos(repos, inplace=True)
+
     # Save results into session state so the user can navigate tabs without refetching.
-    st.session_state["repos"] = repos
+    st.session_state["repos"] = enriched
+    st.session_state["repos_key"] = repos_fingerprint(username_input, enriched)
 
     # build_repo_rows transforms raw GitHub API dictionaries into cleaner rows for UI/SQLite.
-    st.session_state["repo_rows"] = build_repo_rows(repos, username=username_input)
+    repo_rows = build_repo_rows(repos, username=username_input, enriched=enriched)
+    st.session_state["repo_rows"] = repo_rows
+
+    # Name -> row index, built once per fetch, so batch scoring can look rows up
+    # directly instead of scanning the whole list for every repo.
+    st.session_state["row_by_name"] = {x.get("name"): x for x in repo_rows if x.get("name")}
 
     # Reset scoring state since we fetched a new account.
     st.session_state["scores"] = []
+    st.session_state["score_matrix"] = None
     st.session_state["portfolio_summary"] = None
     st.session_state["last_run_id"] = None
 
@@ -361,7 +705,9 @@ if fetch_btn:
 # Pull state into local variables (purely for readability).
 repos = st.session_state["repos"]
 repo_rows = st.session_state["repo_rows"]
+row_by_name = st.session_state["row_by_name"]
 username = st.session_state["username"]
+repos_key = st.session_state["repos_key"]
 
 
 # Tabs organize the app into separate views.
@@ -390,7 +736,7 @@ with tabs[0]:
     st.header("Dashboard")
 
     # compute_summary calculates aggregate account metrics (stars, activity, etc.)
-    summary = compute_summary(repos)
+    summary = cached_summary(repos_key, repos)
 
     # High-level metrics displayed at the top.
     c1, c2, c3, c4 = st.columns(4)
@@ -404,7 +750,7 @@ with tabs[0]:
 
     # If batch scoring has run, show averages and charts.
     if scores:
-        avg = average_scores(scores)          # average score across scored repos
+        avg = average_scores(scores, matrix=st.session_state["score_matrix"])  # average score across scored repos
         conf = confidence_score(scores)       # confidence estimate (how reliable snapshot is)
 
         # Using Streamlit's metric "help" creates hover tooltips with ⓘ
@@ -418,17 +764,25 @@ with tabs[0]:
         st.subheader("Developer Score Visualization (Total Score per Repo)")
         st.caption("Hover tooltips: Total = overall score. See ⓘ next to metric labels above.")
 
-        chart_df = pd.DataFrame([{"repo": r["repo"], "total_score": r["total_score"]} for r in scores])
-        chart_df = chart_df.sort_values("total_score", ascending=False).set_index("repo")
-        st.bar_chart(chart_df)
+        # A plain dict (repo -> score) is all st.bar_chart needs, so I skip building
+        # a DataFrame. sort=False keeps my highest-first order instead of A-Z.
+        ranked = sorted(scores, key=lambda r: r["total_score"] or 0, reverse=True)
+        st.bar_chart({r["repo"]: r["total_score"] for r in ranked}, sort=False)
 
         st.divider()
         st.subheader("Portfolio Summary")
 
         # This button triggers an LLM to summarize across all repo scores.
         if st.button("Generate Portfolio Summary (LLM)"):
+            from llm_utils import analyze_portfolio_summary  # lazy: see imports note
+
             with st.spinner("Generating portfolio summary..."):
-                ps, err = analyze_portfolio_summary(username, scores)
+                ps, err = analyze_portfolio_summary(
+                    username,
+                    scores,
+                    use_cache=use_llm_cache,
+                    cache_minutes=int(llm_cache_minutes),
+                )
                 if err:
                     st.error(err)
                 else:
@@ -453,18 +807,23 @@ with tabs[0]:
         st.subheader("Export")
 
         # Export creates a PDF report and then provides a download button.
+        # The PDF is built in memory and handed straight to the download button,
+        # so nothing is written to disk and read back.
         if st.button("Export PDF"):
-            pdf_path = export_recruiter_pdf(
+            from report_utils import export_recruiter_pdf  # lazy: see imports note
+
+            pdf_bytes = export_recruiter_pdf(
                 username=username,
                 summary=summary,
                 avg_scores=avg,
                 repo_rows=scores,
+                as_bytes=True,
             )
             st.success("PDF created.")
             st.download_button(
                 "Download PDF",
-                data=open(pdf_path, "rb").read(),
-                file_name=os.path.basename(pdf_path),
+                data=pdf_bytes,
+                file_name=f"{username}_recruiter_report.pdf",
                 mime="application/pdf",
             )
     else:
@@ -477,46 +836,14 @@ with tabs[0]:
 with tabs[1]:
     st.header("Repo Explorer")
 
-    # Convert rows into DataFrame so Streamlit can display it nicely.
-    df = pd.DataFrame(repo_rows)
+    # Convert rows into a display-ready DataFrame (cached, so only built once per fetch).
+    df = cached_explorer_df(repos_key, repo_rows)
     if df.empty:
         st.warning("No repo rows.")
         st.stop()
 
-    # Choose columns that are useful in an explorer table.
-    cols = [
-        "name",
-        "html_url",
-        "language",
-        "stargazers_count",
-        "forks_count",
-        "open_issues_count",
-        "days_since_push",
-        "archived",
-    ]
-
-    # Only keep columns that actually exist, preventing KeyError crashes.
-    cols = [c for c in cols if c in df.columns]
-    df = df[cols].copy()
-
-    # Use LinkColumn so URLs are clickable.
-    st.dataframe(
-        df.rename(
-            columns={
-                "name": "Repo",
-                "html_url": "Link",
-                "language": "Language",
-                "stargazers_count": "Stars",
-                "forks_count": "Forks",
-                "open_issues_count": "Open Issues",
-                "days_since_push": "Days Since Push",
-                "archived": "Archived",
-            }
-        ),
-        column_config={"Link": st.column_config.LinkColumn("Link")},
-        use_container_width=True,
-        hide_index=True,
-    )
+    # URLs are rendered as clickable links either way.
+    render_table(df)
 
 
 # ----------------------------
@@ -526,11 +853,12 @@ with tabs[2]:
     st.header("Language Distribution")
 
     # top_languages returns a list like: [{"language": "Python", "repo_count": 3}, ...]
-    langs = top_languages(repos, n=25)
+    langs = cached_top_languages(repos_key, repos, n=25)
 
     # Bar chart expects a mapping: label -> value.
+    # langs is already most-common-first, and sort=False keeps that order.
     if langs:
-        st.bar_chart({row["language"]: row["repo_count"] for row in langs})
+        st.bar_chart({row["language"]: row["repo_count"] for row in langs}, sort=False)
     else:
         st.info("No language data available.")
 
@@ -578,11 +906,14 @@ with tabs[3]:
                 result = cached
                 st.success("Loaded from LLM cache.")
             else:
+                from llm_utils import analyze_repo_quality_with_llm  # lazy: see imports note
+
                 # analyze_repo_quality_with_llm returns (result_dict, error_string)
                 result, err = analyze_repo_quality_with_llm(
                     repo_full_name=f"{username}/{selected_repo}",
                     readme_text=readme_text,
                     code_files=code_files,
+                    use_cache=False,  # cached by repo content in this tab already
                 )
 
                 # If the provider failed, stop so we don’t show empty UI.
@@ -636,86 +967,73 @@ with tabs[3]:
 
     # Batch scoring runs over N repos (chosen in sidebar).
     if score_btn:
-        results = []
+        # Pick the repos (and their rows) first, on the main thread.
+        # I score the most recent repos first because those are likely most relevant.
+        jobs = []
+        for r in repos[: int(repos_to_score)]:
+            repo_name = r.get("name")
+            if not repo_name:
+                continue
+
+            # Find the row data corresponding to this repo name.
+            row = row_by_name.get(repo_name)
+            if row is None:
+                continue
+
+            jobs.append((repo_name, row))
+
+        results = [None] * len(jobs)
+
+        # Look up every repo's fast cache key in one batch before starting the
+        # threads, instead of one cache read per repo inside each thread.
+        prefetched = None
+        if use_llm_cache and jobs:
+            fast_keys = [k for k in (repo_fast_key(username, n, r) for n, r in jobs) if k]
+            prefetched = cache_get_many(LLM_CACHE_DIR, fast_keys, ttl_minutes=int(llm_cache_minutes))
+
+        # Metadata scores (activity/popularity/health) for every repo in one array
+        # pass; each thread only adds its LLM score on top.
+        hard_parts = score_many([row for _, row in jobs]).tolist()
 
         with st.spinner("Running LLM scoring across repos..."):
-            # I score the most recent repos first because those are likely most relevant.
-            for r in repos[: int(repos_to_score)]:
-                repo_name = r.get("name")
-                if not repo_name:
-                    continue
-
-                # Find the row data corresponding to this repo name.
-                row = next((x for x in repo_rows if x.get("name") == repo_name), None)
-                if row is None:
-                    continue
-
-                readme_text, code_files = fetch_repo_sample(username, repo_name)
-
-                cache_key = make_llm_cache_key(
-                    f"{username}/{repo_name}",
-                    readme_text,
-                    code_files,
-                    model_name=LLM_CACHE_VERSION,
-                )
-
-                cached = cache_get(LLM_CACHE_DIR, cache_key, ttl_minutes=int(llm_cache_minutes)) if use_llm_cache else None
-
-                if cached is not None:
-                    llm_result = cached
-                else:
-                    llm_result, err = analyze_repo_quality_with_llm(
-                        repo_full_name=f"{username}/{repo_name}",
-                        readme_text=readme_text,
-                        code_files=code_files,
-                    )
-
-                    # If the LLM fails, I store an error object instead of crashing the batch run.
-                    if err:
-                        llm_result = {
-                            "repo_summary": "",
-                            "strengths": [],
-                            "weaknesses": [],
-                            "suggested_improvements": [],
-                            "skill_score": None,
-                            "notes": f"LLM error: {err}",
-                            "raw_output": "",
-                        }
-
-                    # Cache even error responses so I don’t spam the provider on repeated runs.
-                    if use_llm_cache and llm_result is not None:
-                        cache_set(LLM_CACHE_DIR, cache_key, llm_result)
-
-                # Combine LLM skill score with hard/activity/popularity/health scores.
-                combined = combined_repo_score(row, llm_skill_score=llm_result.get("skill_score"))
-
-                # Store both numeric scores and LLM text output for UI.
-                results.append(
-                    {
-                        "repo": repo_name,
-                        "url": row.get("html_url", ""),
-                        "language": row.get("language", ""),
-                        "total_score": combined.get("total_score"),
-                        "llm_skill_score": combined.get("llm_skill_score"),
-                        "hard_score": combined.get("hard_score"),
-                        "activity_score": combined.get("activity_score"),
-                        "popularity_score": combined.get("popularity_score"),
-                        "health_score": combined.get("health_score"),
-                        "strengths": llm_result.get("strengths", []),
-                        "weaknesses": llm_result.get("weaknesses", []),
-                        "notes": llm_result.get("notes", ""),
+            progress = st.progress(0.0)
+
+            # Each repo is mostly waiting on the network (GitHub + LLM), so a few
+            # threads let those waits overlap instead of happening one after another.
+            # Only plain Python work runs in the threads; all st.* calls stay here.
+            if jobs:
+                with ThreadPoolExecutor(max_workers=min(8, len(jobs))) as ex:
+                    futures = {
+                        ex.submit(
+                            score_repo,
+                            username,
+                            repo_name,
+                            row,
+                            use_llm_cache,
+                            int(llm_cache_minutes),
+                            prefetched,
+                            hard_parts[i],
+                        ): i
+                        for i, (repo_name, row) in enumerate(jobs)
                     }
-                )
+
+                    for done, fut in enumerate(as_completed(futures), start=1):
+                        # Keep results in the original (most recent first) order.
+                        results[futures[fut]] = fut.result()
+                        progress.progress(done / len(jobs))
 
         # Save results to session state so other tabs can use them.
         st.session_state["scores"] = results
         st.session_state["portfolio_summary"] = None
 
+        # Numeric scores as one NumPy array (a column per score field), built once
+        # here so the Dashboard averages don't loop over the dicts on every rerun.
+        st.session_state["score_matrix"] = score_matrix(results)
+
         # Persist batch run to SQLite database so it shows in History tab.
-        init_db()
+        # (db_utils reuses pooled connections, and set up the tables once.)
         run_id = create_run(username, repo_count=len(repos))
-        for row in results:
-            save_repo_score(run_id, row)
+        save_repo_scores(run_id, results)
 
         st.session_state["last_run_id"] = run_id
         st.success(f"Scoring complete. Saved run_id={run_id} to SQLite (github.db).")
@@ -724,76 +1042,67 @@ with tabs[3]:
     scores = st.session_state["scores"]
     if scores:
         st.subheader("Per-Repo Scores (click link)")
-        df_scores = pd.DataFrame(scores)
-
-        st.dataframe(
-            df_scores[
-                [
-                    "repo",
-                    "url",
-                    "language",
-                    "total_score",
-                    "llm_skill_score",
-                    "hard_score",
-                    "activity_score",
-                    "popularity_score",
-                    "health_score",
-                ]
-            ].rename(
-                columns={
-                    "repo": "Repo",
-                    "url": "Link",
-                    "language": "Language",
-                    "total_score": "Total",
-                    "llm_skill_score": "LLM Skill",
-                    "hard_score": "Hard",
-                    "activity_score": "Activity",
-                    "popularity_score": "Popularity",
-                    "health_score": "Health",
-                }
-            ),
-            column_config={"Link": st.column_config.LinkColumn("Link")},
-            use_container_width=True,
-            hide_index=True,
+        df_scores = columns_frame(
+            scores,
+            {
+                "repo": "Repo",
+                "url": "Link",
+                "language": "Language",
+                "total_score": "Total",
+                "llm_skill_score": "LLM Skill",
+                "hard_score": "Hard",
+                "activity_score": "Activity",
+                "popularity_score": "Popularity",
+                "health_score": "Health",
+            },
         )
 
+        render_table(df_scores)
+
         st.subheader("Per-Repo LLM Breakdown")
         st.caption(
             "Score meanings: Hard = engineering depth signals, Activity = recency, Popularity = stars/forks, Health = hygiene."
         )
 
-        # Expanders let the user open each repo to see detailed results.
-        for r in scores:
-            title = f"{r.get('repo')} | Total={r.get('total_score')} | LLM={r.get('llm_skill_score')}"
-            with st.expander(title):
-                # For each repo, I show metrics with tooltips so the meaning is visible on hover.
-                a, b, c, d, e, f = st.columns(6)
-                a.metric("Total", r.get("total_score"), help=TOOLTIPS["Total"])
-                b.metric("LLM Skill", r.get("llm_skill_score"), help=TOOLTIPS["LLM Skill"])
-                c.metric("Hard", r.get("hard_score"), help=TOOLTIPS["Hard"])
-                d.metric("Activity", r.get("activity_score"), help=TOOLTIPS["Activity"])
-                e.metric("Popularity", r.get("popularity_score"), help=TOOLTIPS["Popularity"])
-                f.metric("Health", r.get("health_score"), help=TOOLTIPS["Health"])
-
-                st.write("**Strengths**")
-                strengths = r.get("strengths", []) or []
-                if strengths:
-                    for s in strengths:
-                        st.write(f"- {s}")
-                else:
-                    st.write("- (none returned)")
+        # The user picks ONE repo and only that repo's details are rendered.
+        # (An expander per repo still builds every hidden widget on every rerun:
+        # 6 metrics + 2 lists per repo, even when they are all collapsed.)
+        titles = [
+            f"{r.get('repo')} | Total={r.get('total_score')} | LLM={r.get('llm_skill_score')}"
+            for r in scores
+        ]
+        picked = st.selectbox("Open repo", range(len(scores)), format_func=titles.__getitem__)
+        r = scores[picked]
+
+        with st.container(border=True):
+            # I show metrics with tooltips so the meaning is visible on hover.
+            a, b, c, d, e, f = st.columns(6)
+            a.metric("Total", r.get("total_score"), help=TOOLTIPS["Total"])
+            b.metric("LLM Skill", r.get("llm_skill_score"), help=TOOLTIPS["LLM Skill"])
+            c.metric("Hard", r.get("hard_score"), help=TOOLTIPS["Hard"])
+            d.metric("Activity", r.get("activity_score"), help=TOOLTIPS["Activity"])
+            e.metric("Popularity", r.get("popularity_score"), help=TOOLTIPS["Popularity"])
+            f.metric("Health", r.get("health_score"), help=TOOLTIPS["Health"])
+
+            st.write("**Strengths**")
+            strengths = r.get("strengths", []) or []
+            if strengths:
+                for s in strengths:
+                    st.write(f"- {s}")
+            else:
+                st.write("- (none returned)")
 
-                st.write("**Weaknesses**")
-                weaknesses = r.get("weaknesses", []) or []
-                if weaknesses:
-                    for w in weaknesses:
-                        st.write(f"- {w}")
-                else:
-                    st.write("- (none returned)")
+            st.write("**Weaknesses**")
+            weaknesses = r.get("weaknesses", []) or []
+            if weaknesses:
+                for w in weaknesses:
+                    st.write(f"- {w}")
+            else:
+                st.write("- (none returned)")
 
-                notes = r.get("notes", "")
-                if notes:
-                    st.caption(notes)
+            notes = r.get("notes", "")
+            if notes:
+                st.caption(notes)
 
 
 # ----------------------------
@@ -802,10 +1111,8 @@ with tabs[3]:
 with tabs[4]:
     st.header("History (SQLite)")
 
-    # init_db ensures tables exist, even on a fresh install.
-    init_db()
-
     # get_recent_runs loads the most recent scoring runs saved in github.db
+    # (db_utils creates the tables on first use, so this works on a fresh install too.)
     runs = get_recent_runs(limit=10)
 
     if not runs:
@@ -820,29 +1127,11 @@ with tabs[4]:
         chosen_run = st.selectbox("View run_id", run_ids)
 
         if chosen_run:
-            # Load all repo score rows from that run.
-            rows = get_run_repo_scores(chosen_run)
-
-            hist_df = pd.DataFrame(
-                rows,
-                columns=[
-                    "repo",
-                    "url",
-                    "language",
-                    "total_score",
-                    "llm_skill_score",
-                    "hard_score",
-                    "activity_score",
-                    "popularity_score",
-                    "health_score",
-                    "strengths",
-                    "weaknesses",
-                    "notes",
-                ],
-            )
+            # Load all repo score rows from that run, straight into a DataFrame.
+            hist_df = get_run_repo_scores_df(chosen_run)
 
             st.dataframe(
-                hist_df.rename(columns={"url": "Link"}),
+                hist_df,
                 column_config={"Link": st.column_config.LinkColumn("Link")},
                 use_container_width=True,
                 hide_index=True,
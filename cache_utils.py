@@ -8,28 +8,358 @@
 # - Streamlit reruns the script often (every click), so caching prevents re-doing work.
 # - LLM calls can be slow / rate-limited, so caching helps me stay within free quota.
 # - Storing as JSON files keeps it beginner-friendly and easy to inspect in the filesystem.
+#   (When msgpack / zstandard are installed I store a faster binary format instead,
+#   but plain .json files are still read, and still written if neither is installed.)
+# - New entries go into ONE SQLite file per cache folder (cache/llm/cache.sqlite)
+#   instead of one file per key: one open per process, then each lookup is a
+#   B-tree search instead of a stat + open + read. The old per-key files are
+#   still read as a fallback, and used again if the SQLite file can't be opened.
 
 import os       # Used for file paths and creating folders
 import json     # Used to save/load cached objects as JSON
 import time     # Used to calculate cache age (TTL)
 import hashlib  # Used to create stable hashed cache keys
+import sqlite3  # Single-file key/value store for the cache entries
+import threading  # Lock for the in-memory layer (used from several threads)
+from collections import OrderedDict  # Small LRU for the in-memory layer
+from functools import lru_cache      # Remember which cache folders already exist
 
+# Optional: zstandard compresses cache files (LLM JSON is mostly text, so it
+# shrinks a lot). If it isn't installed I keep writing uncompressed files.
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
+# Optional: orjson parses and writes JSON several times faster than the built-in
+# json module. It returns the same dicts/lists json.loads would.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: msgpack is a binary format for the same data JSON can hold
+# (dicts, lists, strings, numbers), but much faster to load than parsing JSON text.
+# I use it instead of pickle because loading a pickle file can run arbitrary code.
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+@lru_cache(maxsize=None)
 def ensure_dir(path):
     """
     Ensure a directory exists.
     exist_ok=True prevents errors if the folder already exists.
+
+    Memoized: after the first call for a folder, later calls are just a dict
+    lookup instead of a mkdir system call. If the folder gets deleted while the
+    program runs, cache_set notices and calls ensure_dir.cache_clear().
     """
     os.makedirs(path, exist_ok=True)
 
 
+def _new_hash(data=b""):
+    """
+    The hash used for every cache key in this file.
+
+    Cache keys only need to be unique, not cryptographically secure, so I use
+    BLAKE2b with a 16-byte (128-bit) digest: faster than SHA256 in pure software
+    and still far more bits than needed to avoid collisions between cache entries.
+    """
+    return hashlib.blake2b(data, digest_size=16)
+
+
 def _hash_key(s):
     """
-    Convert an input string into a fixed-length SHA256 hex string.
+    Convert an input string into a fixed-length hex string (BLAKE2b, 128-bit).
     I do this so cache file names are safe (no slashes, spaces, etc.)
     and consistent length regardless of input size.
     """
-    return hashlib.sha256(s.encode("utf-8")).hexdigest()
+    return _new_hash(s.encode("utf-8")).hexdigest()
+
+
+def _cache_formats():
+    """
+    File suffixes I can read, best first. The first one is also what cache_set writes.
+    Plain .json is always last, so old cache files (and installs without the
+    optional packages) keep working.
+    """
+    formats = []
+    if msgpack is not None:
+        if zstandard is not None:
+            formats.append(".msgpack.zst")
+        formats.append(".msgpack")
+    if zstandard is not None:
+        formats.append(".json.zst")
+    formats.append(".json")
+    return formats
+
+
+def _json_bytes(obj, indent=False):
+    """
+    obj as UTF-8 JSON bytes, with orjson when it's installed.
+    indent=True is for plain .json files: human-readable if I open them later.
+    orjson refuses a few things json accepts (e.g. integers past 64 bits);
+    those still get written by the json module.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+
+def _encode(obj, suffix):
+    """Serialize obj into the bytes stored in a <key><suffix> file."""
+    if suffix.startswith(".msgpack"):
+        data = msgpack.packb(obj, use_bin_type=True)
+    else:
+        data = _json_bytes(obj, indent=not suffix.endswith(".zst"))
+
+    if suffix.endswith(".zst"):
+        # zstd level 3 is fast, and still a big size win on text.
+        data = zstandard.ZstdCompressor(level=3).compress(data)
+    return data
+
+
+def _decode(data, suffix):
+    """Turn the bytes of a <key><suffix> file back into a Python object."""
+    if suffix.endswith(".zst"):
+        data = zstandard.ZstdDecompressor().decompress(data)
+    if suffix.startswith(".msgpack"):
+        return msgpack.unpackb(data, raw=False)
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# ----------------------------
+# In-memory layer (in front of the files)
+# ----------------------------
+# Streamlit reruns the script on every click and asks for the same keys again,
+# so I keep recently used entries in memory as (written_at, obj).
+# A hit here skips the stat + open + decompress + JSON parse entirely.
+# TTL still works because I keep the original write time and check it on every get.
+_MEM_MAX = 512                  # how many entries to keep before evicting the oldest
+_mem = OrderedDict()            # (cache_dir, key) -> (written_at, obj), oldest first
+_mem_lock = threading.Lock()    # scoring threads read/write the cache at the same time
+
+
+def _mem_put(cache_dir, key, written_at, obj):
+    with _mem_lock:
+        _mem[(cache_dir, key)] = (written_at, obj)
+        _mem.move_to_end((cache_dir, key))
+        while len(_mem) > _MEM_MAX:
+            _mem.popitem(last=False)
+
+
+def clear_memory_cache():
+    """
+    Forget every in-memory entry and close the open cache.sqlite connections.
+    Call this BEFORE deleting cache files on disk (e.g. the app's "Clear LLM
+    cache" button): an open SQLite file can't be deleted on Windows, and on
+    Linux it would stay alive through the old connection. The next get/set
+    opens a fresh connection.
+    """
+    with _mem_lock:
+        _mem.clear()
+    with _kv_lock:
+        for conn in _kv_conns.values():
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        _kv_conns.clear()
+
+
+# ----------------------------
+# SQLite key/value store (one file per cache folder)
+# ----------------------------
+# Table kv: k = cache key, fmt = suffix saying how v is encoded (".msgpack.zst",
+# ".json", ... same as the file formats above), v = the encoded bytes,
+# written_at = time.time() of the write (used for the TTL check).
+KV_FILE = "cache.sqlite"
+_kv_conns = {}                  # cache_dir -> open sqlite3 connection
+_kv_lock = threading.Lock()     # one connection per folder is shared by the scoring threads
+
+
+def _kv_conn(cache_dir, create):
+    """
+    Return the open connection for cache_dir's cache.sqlite (the caller holds _kv_lock).
+
+    create=False is for reads: if the file doesn't exist yet there is nothing to
+    read, so I return None instead of creating an empty database.
+    """
+    conn = _kv_conns.get(cache_dir)
+    if conn is not None:
+        return conn
+
+    path = os.path.join(cache_dir, KV_FILE)
+    if not create and not os.path.exists(path):
+        return None
+
+    ensure_dir(cache_dir)
+    try:
+        conn = sqlite3.connect(path, check_same_thread=False)
+    except sqlite3.OperationalError:
+        # The folder was deleted after ensure_dir remembered it; make it again.
+        ensure_dir.cache_clear()
+        ensure_dir(cache_dir)
+        conn = sqlite3.connect(path, check_same_thread=False)
+
+    # WAL + synchronous=NORMAL: readers don't block the writer, and a commit
+    # doesn't fsync (durable=True in cache_set turns that back on per write).
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS kv (
+        k TEXT PRIMARY KEY,
+        fmt TEXT NOT NULL,
+        v BLOB NOT NULL,
+        written_at REAL NOT NULL
+    )
+    """)
+    conn.commit()
+
+    _kv_conns[cache_dir] = conn
+    return conn
+
+
+def _kv_get(cache_dir, key):
+    """
+    Read one entry from cache.sqlite.
+    Returns (written_at, obj), or None if it isn't there (or can't be read).
+    """
+    try:
+        with _kv_lock:
+            conn = _kv_conn(cache_dir, create=False)
+            if conn is None:
+                return None
+            row = conn.execute(
+                "SELECT fmt, v, written_at FROM kv WHERE k = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        fmt, data, written_at = row
+        return written_at, _decode(data, fmt)
+    except Exception:
+        # Broken DB file or a format this install can't decode: treat as a miss.
+        return None
+
+
+def _kv_set(cache_dir, key, data, fmt, written_at, durable):
+    """
+    Insert or replace one encoded entry in cache.sqlite. Returns True on success.
+    The transaction makes the write atomic: readers see the old value or the new one.
+    """
+    try:
+        with _kv_lock:
+            conn = _kv_conn(cache_dir, create=True)
+            if durable:
+                conn.execute("PRAGMA synchronous=FULL")
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO kv (k, fmt, v, written_at) VALUES (?, ?, ?, ?)",
+                        (key, fmt, data, written_at),
+                    )
+            finally:
+                if durable:
+                    conn.execute("PRAGMA synchronous=NORMAL")
+        return True
+    except sqlite3.Error:
+        return False
+
+
+# SQLite limits how many "?" one statement may have, so big key lists are split.
+_KV_BATCH = 500
+
+
+def _kv_get_many(cache_dir, keys):
+    """
+    Read several entries from cache.sqlite with one SELECT per batch of keys.
+    Returns {key: (written_at, obj)} for the keys that were found and readable.
+    """
+    found = {}
+    try:
+        with _kv_lock:
+            conn = _kv_conn(cache_dir, create=False)
+            if conn is None:
+                return found
+            rows = []
+            for start in range(0, len(keys), _KV_BATCH):
+                batch = keys[start:start + _KV_BATCH]
+                marks = ",".join("?" * len(batch))
+                rows.extend(conn.execute(
+                    f"SELECT k, fmt, v, written_at FROM kv WHERE k IN ({marks})", batch
+                ).fetchall())
+    except sqlite3.Error:
+        return found
+
+    # Decode outside the lock so other threads can use the DB meanwhile.
+    for k, fmt, data, written_at in rows:
+        try:
+            found[k] = (written_at, _decode(data, fmt))
+        except Exception:
+            pass
+    return found
+
+
+def _kv_set_many(cache_dir, entries, durable):
+    """
+    Insert or replace several encoded entries in ONE transaction.
+    entries is a list of (key, fmt, data, written_at). Returns True on success.
+    """
+    try:
+        with _kv_lock:
+            conn = _kv_conn(cache_dir, create=True)
+            if durable:
+                conn.execute("PRAGMA synchronous=FULL")
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO kv (k, fmt, v, written_at) VALUES (?, ?, ?, ?)",
+                        entries,
+                    )
+            finally:
+                if durable:
+                    conn.execute("PRAGMA synchronous=NORMAL")
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def _disk_get(cache_dir, key):
+    """
+    Read one cache entry from disk.
+    Returns (mtime, obj), or None if there is no readable file for this key.
+    """
+    # Cache file path is like: cache/llm/<key>.msgpack.zst (or an older <key>.json)
+    for suffix in _cache_formats():
+        path = os.path.join(cache_dir, key + suffix)
+
+        # If there's no file, try the next format.
+        if not os.path.exists(path):
+            continue
+
+        # File modification time = "last time this cache was written"
+        mtime = os.path.getmtime(path)
+
+        # Try to open and decode the file.
+        try:
+            with open(path, "rb") as f:
+                return mtime, _decode(f.read(), suffix)
+        except Exception:
+            # If the cache file is corrupted or unreadable, just ignore it.
+            return None
+
+    return None
 
 
 def cache_get(cache_dir, key, ttl_minutes):
@@ -40,6 +370,7 @@ def cache_get(cache_dir, key, ttl_minutes):
       - cache_dir: folder where cache files live (ex: "cache/llm")
       - key: file name key (usually a hash)
       - ttl_minutes: "time to live" in minutes, how long cache is valid
+        (None: any age, e.g. to revalidate an expired entry with the server)
 
     Returns:
       - Cached JSON object (Python dict/list) if present and not expired
@@ -51,57 +382,206 @@ def cache_get(cache_dir, key, ttl_minutes):
     Design choice:
     I return None on failure instead of raising exceptions so the app
     doesn't crash just because cache is missing/broken.
+
+    Note: memory hits return the same object every time, so callers should
+    treat the result as read-only.
     """
-    ensure_dir(cache_dir)
+    ttl_seconds = ttl_minutes * 60 if ttl_minutes is not None else float("inf")
 
-    # Cache file path is like: cache/llm/<key>.json
-    path = os.path.join(cache_dir, f"{key}.json")
+    # 1) Memory first. If the memory copy is too old, the file might have been
+    #    rewritten since (another process), so I still check the disk below.
+    with _mem_lock:
+        hit = _mem.get((cache_dir, key))
+        if hit is not None:
+            _mem.move_to_end((cache_dir, key))
+    if hit is not None and time.time() - hit[0] <= ttl_seconds:
+        return hit[1]
 
-    # If there's no file, there's no cached value.
-    if not os.path.exists(path):
+    # 2) cache.sqlite, then the older one-file-per-key layout.
+    #    (No ensure_dir here: a missing folder is just a miss.)
+    found = _kv_get(cache_dir, key)
+    if found is None:
+        found = _disk_get(cache_dir, key)
+    if found is None:
         return None
 
-    # File modification time = "last time this cache was written"
-    # Age is current time minus that modified time.
-    age_seconds = time.time() - os.path.getmtime(path)
+    written_at, obj = found
+    _mem_put(cache_dir, key, written_at, obj)
 
-    # TTL check: if the file is too old, treat it as missing.
-    if age_seconds > (ttl_minutes * 60):
+    # TTL check: age is current time minus the last write time.
+    # If the entry is too old, treat it as missing.
+    if time.time() - written_at > ttl_seconds:
         return None
+    return obj
+
+
+def _disk_set(cache_dir, key, data, suffix, durable):
+    """
+    Write one encoded entry as its own <key><suffix> file. Returns True on success.
+    Only used when cache.sqlite can't be written (e.g. a read-only or odd filesystem).
+    """
+    ensure_dir(cache_dir)
+    path = os.path.join(cache_dir, key + suffix)
+
+    # I write to a temporary file first and then os.replace() it into place.
+    # os.replace is atomic, so a reader sees either the old file or the new one,
+    # never a half-written file (which would be an unreadable "miss" and cost
+    # another LLM call). The temp name is unique per thread so parallel writers
+    # of the same key can't interleave their bytes.
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
 
-    # Try to open and parse the JSON.
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        try:
+            f = open(tmp, "wb")
+        except FileNotFoundError:
+            # The folder was deleted after ensure_dir remembered it; make it again.
+            ensure_dir.cache_clear()
+            ensure_dir(cache_dir)
+            f = open(tmp, "wb")
+        with f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
     except Exception:
-        # If the cache file is corrupted or unreadable, just ignore it.
-        return None
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return False
+    return True
 
 
-def cache_set(cache_dir, key, obj):
+def cache_set(cache_dir, key, obj, durable=False, json_bytes=None):
     """
-    Write a Python object to cache as JSON.
+    Write a Python object to cache (msgpack/zstd when available, else JSON).
 
     Inputs:
       - cache_dir: folder for cached files
       - key: cache key (filename)
       - obj: any JSON-serializable Python object (dict/list/etc.)
+      - durable: if True, fsync before the write counts as done, so the entry
+        also survives a power loss (slower; off by default)
+      - json_bytes: optional JSON text of obj that the caller already has
+        (e.g. an HTTP response body). It is stored as-is (zstd-compressed when
+        available) instead of serializing obj all over again.
 
     Behavior:
+      - The entry goes into cache_dir/cache.sqlite; if that fails, into a
+        <key><suffix> file like older versions did.
       - If writing fails, I silently ignore it. That way caching can fail
         without breaking the entire program.
     """
-    ensure_dir(cache_dir)
-
-    path = os.path.join(cache_dir, f"{key}.json")
-
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            # indent=2 makes the JSON human-readable if I open the file later
-            json.dump(obj, f, indent=2)
+        if json_bytes is not None:
+            suffix = ".json.zst" if zstandard is not None else ".json"
+            data = json_bytes
+            if zstandard is not None:
+                data = zstandard.ZstdCompressor(level=3).compress(data)
+        else:
+            # The first format is the preferred one (binary/compressed when available).
+            suffix = _cache_formats()[0]
+            data = _encode(obj, suffix)
     except Exception:
-        # If disk permissions or serialization fails, don't crash the app.
-        pass
+        # If serialization fails, don't crash the app.
+        return
+
+    written_at = time.time()
+    if not _kv_set(cache_dir, key, data, suffix, written_at, durable):
+        if not _disk_set(cache_dir, key, data, suffix, durable):
+            return
+
+    # Keep the fresh value in memory too, so the next get doesn't touch the disk.
+    _mem_put(cache_dir, key, written_at, obj)
+
+
+def cache_get_many(cache_dir, keys, ttl_minutes):
+    """
+    cache_get for several keys at once. Returns {key: obj or None} for every key.
+
+    Memory hits are answered first; all the rest are looked up in cache.sqlite
+    with one query (instead of one query per key), and only keys still missing
+    fall back to the older per-key files. Same TTL rules as cache_get.
+    """
+    ttl_seconds = ttl_minutes * 60 if ttl_minutes is not None else float("inf")
+    now = time.time()
+    out = {}
+    missing = []
+
+    # 1) Memory
+    with _mem_lock:
+        for key in keys:
+            hit = _mem.get((cache_dir, key))
+            if hit is not None:
+                _mem.move_to_end((cache_dir, key))
+                if now - hit[0] <= ttl_seconds:
+                    out[key] = hit[1]
+                    continue
+            missing.append(key)
+
+    if not missing:
+        return out
+
+    # 2) cache.sqlite (one query), then the older per-key files.
+    found = _kv_get_many(cache_dir, missing)
+    for key in missing:
+        entry = found.get(key) or _disk_get(cache_dir, key)
+        if entry is None:
+            out[key] = None
+            continue
+        written_at, obj = entry
+        _mem_put(cache_dir, key, written_at, obj)
+        out[key] = obj if now - written_at <= ttl_seconds else None
+
+    return out
+
+
+def cache_set_many(cache_dir, items, durable=False):
+    """
+    cache_set for several entries at once: items is a dict {key: obj}
+    (or any iterable of (key, obj) pairs).
+
+    Everything is written in one SQLite transaction, so it costs one commit
+    instead of one per key. Failures are ignored, like cache_set.
+    """
+    if isinstance(items, dict):
+        items = items.items()
+
+    suffix = _cache_formats()[0]
+    written_at = time.time()
+    encoded = []    # (key, obj, data)
+    for key, obj in items:
+        try:
+            encoded.append((key, obj, _encode(obj, suffix)))
+        except Exception:
+            # Skip anything that can't be serialized, keep the rest.
+            continue
+
+    if not encoded:
+        return
+
+    entries = [(key, suffix, data, written_at) for key, _, data in encoded]
+    if not _kv_set_many(cache_dir, entries, durable):
+        # Per-key files as the fallback; only remember the ones that were written.
+        encoded = [e for e in encoded if _disk_set(cache_dir, e[0], e[2], suffix, durable)]
+
+    for key, obj, _ in encoded:
+        _mem_put(cache_dir, key, written_at, obj)
+
+
+def _hash_field(h, tag, text):
+    """
+    Feed one labeled text field into a running hash.
+
+    Each field is written as: tag byte + byte length + the bytes themselves.
+    The length prefix keeps fields from running into each other, so e.g.
+    ("ab", "c") and ("a", "bc") can never produce the same key.
+    """
+    data = (text or "").encode("utf-8")
+    h.update(tag)
+    h.update(len(data).to_bytes(8, "little"))
+    h.update(data)
 
 
 def make_llm_cache_key(repo_full_name, readme_text, code_files, model_name="default"):
@@ -120,28 +600,52 @@ def make_llm_cache_key(repo_full_name, readme_text, code_files, model_name="defa
     I only use the first 1500 characters of README and each file content.
     This is a tradeoff, but it's good enough for caching and avoids giant keys.
 
+    Why I stream into the hash:
+    I used to build one big sorted JSON string of all of this and then hash it.
+    Feeding each piece to the hash directly gives the same "same input -> same key"
+    guarantee without building that large temporary string first.
+
     Returns:
-      - A SHA256 hashed string suitable for a filename.
+      - A 32-character hex hash suitable for a filename.
     """
+    h = _new_hash()
+
+    _hash_field(h, b"R", repo_full_name)
+    _hash_field(h, b"M", model_name)
+
     # Keep hashing stable and small by truncating.
-    readme_part = (readme_text or "")[:1500]
+    _hash_field(h, b"D", (readme_text or "")[:1500])
 
-    # Build a simplified representation of the repo file sample.
-    files_part = []
+    # The sampled files, in the order they were sampled.
     for f in (code_files or []):
-        files_part.append({
-            "path": f.get("path", ""),
-            "content": (f.get("content", "")[:1500])
-        })
-
-    # Serialize the key input as JSON with sort_keys=True
-    # so the string is deterministic (same inputs -> same JSON string).
-    raw = json.dumps({
-        "repo": repo_full_name,
-        "model": model_name,
-        "readme": readme_part,
-        "files": files_part
-    }, sort_keys=True)
-
-    # Hash the JSON string to get a consistent filename-safe key.
-    return _hash_key(raw)
\ No newline at end of file
+        _hash_field(h, b"F", f.get("path", ""))
+        _hash_field(h, b"C", (f.get("content", "") or "")[:1500])
+
+    return h.hexdigest()
+
+
+def make_llm_fast_key(repo_full_name, pushed_at, model_name="default"):
+    """
+    Build a cheap "identity" cache key for LLM outputs, without any repo content.
+
+    GitHub updates pushed_at on every push, so repo name + pushed_at + model is
+    enough to know nothing changed. That lets the caller check the cache BEFORE
+    downloading the README/code sample (a GitHub round-trip per repo).
+
+    The content-based key (make_llm_cache_key) is still the source of truth;
+    this one is just an alias written next to it.
+    """
+    return _hash_key(f"fast|{repo_full_name}|{pushed_at}|{model_name}")
+
+
+def make_llm_prompt_key(prompt, model_name="default"):
+    """
+    Build a cache key for one exact LLM request: the model + the full prompt text.
+
+    llm_utils uses this to skip a Groq call when the very same prompt was already
+    answered (e.g. the portfolio summary for unchanged scores).
+    """
+    h = _new_hash()
+    _hash_field(h, b"M", model_name)
+    _hash_field(h, b"P", prompt)
+    return h.hexdigest()
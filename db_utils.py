@@ -14,24 +14,138 @@
 # Files created:
 # - github.db: the SQLite database file in the project root
 
+import json                     # strengths/weaknesses lists are stored as JSON text
+import queue                    # Thread-safe queue that holds the pooled connections
 import sqlite3                  # Built-in DB library in Python (no install needed)
+from contextlib import contextmanager  # Lets one helper borrow/return (or reuse) a connection
 from datetime import datetime   # Used for timestamps (created_at)
+from functools import lru_cache # Runs the pool setup exactly once
 
 DB_PATH = "github.db"           # SQLite file name (created automatically)
+SQLITE_POOL_SIZE = 4            # How many connections the pool keeps open
 
 
 # ----------------------------
 # Connection helpers
 # ----------------------------
-def get_conn():
+def configure_connection(conn):
+    """
+    Apply the same performance/safety settings to every new connection.
+
+    - journal_mode=WAL: readers don't block the writer, and a commit appends to a
+      log file instead of rewriting the main DB file
+    - synchronous=NORMAL: with WAL this is still safe against app crashes, and it
+      skips an fsync on every commit
+    - temp_store=MEMORY: temporary tables/indexes (e.g. for ORDER BY) stay in RAM
+    - cache_size=-20000: keep ~20 MB of pages cached (negative = size in KB)
+    - mmap_size=256 MB: read pages through memory mapping instead of read() calls
+    - foreign_keys=ON: actually enforce repo_scores.run_id -> runs.id
     """
-    Open a connection to the SQLite database file.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+def _connect():
+    """
+    Open a NEW connection to the SQLite database file (already configured).
 
     Why check_same_thread=False:
     Streamlit can re-run code and manage state in a way that sometimes
     triggers SQLite "thread" warnings. This option avoids that issue.
+    (Pooled connections get handed to whichever thread asks next, so they need it.)
+    """
+    return configure_connection(sqlite3.connect(DB_PATH, check_same_thread=False))
+
+
+@lru_cache(maxsize=1)
+def _bootstrap():
+    """
+    Run init_db() once per process. Later calls are a cached no-op.
+
+    init_db() does the schema_version check, CREATE TABLE IF NOT EXISTS, two
+    PRAGMA table_info migration scans, and a commit. That's only needed once,
+    not on every read like get_recent_runs().
+    """
+    init_db()
+    return True
+
+
+@lru_cache(maxsize=1)
+def _init_pool():
     """
-    return sqlite3.connect(DB_PATH, check_same_thread=False)
+    Build the connection pool the first time any DB function needs it.
+
+    Opening a connection (and running init_db's table/migration checks) on every
+    call was the slow part, and Streamlit calls these functions on every rerun.
+    So the schema setup runs ONCE (_bootstrap) and I keep a few connections open for reuse.
+    LIFO order means the most recently used (warmest) connection is handed out first.
+    """
+    _bootstrap()
+
+    pool = queue.LifoQueue()
+    for _ in range(SQLITE_POOL_SIZE):
+        pool.put(_connect())
+    return pool
+
+
+def reset_pool():
+    """
+    Close the pooled connections and forget the one-time setup.
+
+    The next DB call then opens fresh connections to DB_PATH and runs init_db()
+    again. The tests use this to point the module at a temporary database file.
+    (Connections that are borrowed right now are not closed.)
+    """
+    if _init_pool.cache_info().currsize:
+        pool = _init_pool()
+        while True:
+            try:
+                pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    _init_pool.cache_clear()
+    _bootstrap.cache_clear()
+
+
+@contextmanager
+def get_conn():
+    """
+    Borrow a connection from the pool and give it back when done:
+
+        with get_conn() as conn:
+            conn.execute(...)
+
+    If every pooled connection is busy (other threads), this waits for one.
+    """
+    pool = _init_pool()
+    conn = pool.get()
+    try:
+        yield conn
+    finally:
+        pool.put(conn)
+
+
+@contextmanager
+def _use_conn(conn=None):
+    """
+    Yield a connection for one public DB function.
+
+    - If the caller passes a connection (e.g. to group several calls together),
+      I reuse it as-is and leave it open.
+    - Otherwise I borrow one from the pool and return it afterwards.
+    """
+    if conn is not None:
+        yield conn
+        return
+
+    with get_conn() as conn:
+        yield conn
 
 
 def _table_exists(conn, table_name):
@@ -124,6 +238,7 @@ def _create_base_tables(conn):
     Tables:
     - runs: one row per batch run (username + repo_count + timestamp)
     - repo_scores: one row per repo scored, linked to runs via run_id
+      (plus an index on run_id + total_score for the history view)
     """
     cur = conn.cursor()
 
@@ -156,6 +271,15 @@ def _create_base_tables(conn):
     )
     """)
 
+    # The history view asks for "one run's repos, best score first" on every rerun.
+    # This index lets SQLite jump straight to that run's rows, already in
+    # total_score order, instead of scanning + sorting the whole table.
+    # (IF NOT EXISTS also adds it to older DB files the next time init_db runs.)
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_repo_scores_run_score
+    ON repo_scores(run_id, total_score DESC)
+    """)
+
     conn.commit()
 
 
@@ -247,10 +371,10 @@ def init_db():
 
     Important design:
     - This function is safe to call repeatedly.
-    - I intentionally call init_db() inside each public function so the app does not
-      break if the DB file is deleted or created fresh mid-run.
+    - _bootstrap() runs it once, when the connection pool is first built, so the
+      tables always exist before the first query of any public function.
     """
-    conn = get_conn()
+    conn = _connect()
 
     # Step 1: schema versioning exists
     _ensure_schema_version_table(conn)
@@ -273,68 +397,56 @@ def init_db():
 # ----------------------------
 # Public DB functions used by app.py
 # ----------------------------
-def create_run(username, repo_count):
+def create_run(username, repo_count, conn=None):
     """
     Create a new 'run' record.
 
     Inputs:
       - username: GitHub username analyzed
       - repo_count: number of repos fetched from API
+      - conn: optional open connection to reuse (see _use_conn)
 
     Returns:
       - run_id (int): primary key for this run, used to link repo_scores rows
     """
-    init_db()
+    with _use_conn(conn) as conn:
+        cur = conn.cursor()
 
-    conn = get_conn()
-    cur = conn.cursor()
+        # ISO timestamp is human-readable and sorts correctly in many contexts
+        created_at = datetime.now().isoformat(timespec="seconds")
 
-    # ISO timestamp is human-readable and sorts correctly in many contexts
-    created_at = datetime.now().isoformat(timespec="seconds")
+        cur.execute(
+            "INSERT INTO runs (created_at, username, repo_count) VALUES (?, ?, ?)",
+            (created_at, str(username), int(repo_count))
+        )
 
-    cur.execute(
-        "INSERT INTO runs (created_at, username, repo_count) VALUES (?, ?, ?)",
-        (created_at, str(username), int(repo_count))
-    )
-
-    run_id = cur.lastrowid  # last inserted primary key value
-    conn.commit()
-    conn.close()
+        run_id = cur.lastrowid  # last inserted primary key value
+        conn.commit()
     return run_id
 
 
-def save_repo_score(run_id, row):
-    """
-    Save one repo score row to repo_scores.
+# One INSERT statement shared by the single-row and bulk save functions.
+_INSERT_REPO_SCORE_SQL = """
+INSERT INTO repo_scores (
+    run_id, repo_name, repo_url, language,
+    total_score, llm_skill_score, hard_score,
+    activity_score, popularity_score, health_score,
+    strengths, weaknesses, notes
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
 
-    The 'row' dict is produced by app.py batch scoring.
-    Expected keys:
-      repo, url, language,
-      total_score, llm_skill_score, hard_score,
-      activity_score, popularity_score, health_score,
-      strengths (list), weaknesses (list), notes (string)
 
-    Storage choice:
-    - strengths/weaknesses are lists in Python, but SQLite does not store lists.
-      I store them as newline-separated TEXT so it's readable when viewed later.
+def _repo_score_params(run_id, row):
     """
-    init_db()
-
-    conn = get_conn()
-    cur = conn.cursor()
-
-    # Convert lists to a readable string format
-    strengths_text = "\n".join(row.get("strengths", []) or [])
-    weaknesses_text = "\n".join(row.get("weaknesses", []) or [])
+    Turn one scoring row dict into the parameter tuple for _INSERT_REPO_SCORE_SQL.
+    Shared by save_repo_score() and save_repo_scores() so both store rows the same way.
+    """
+    # SQLite has no list type, so lists are stored as compact JSON text.
+    # That keeps them real lists when read back (see _text_to_list).
+    strengths_text = json.dumps(list(row.get("strengths", []) or []), separators=(",", ":"))
+    weaknesses_text = json.dumps(list(row.get("weaknesses", []) or []), separators=(",", ":"))
 
-    cur.execute("""
-    INSERT INTO repo_scores (
-        run_id, repo_name, repo_url, language,
-        total_score, llm_skill_score, hard_score,
-        activity_score, popularity_score, health_score,
-        strengths, weaknesses, notes
-    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
+    return (
         int(run_id),
         str(row.get("repo", "")),
         str(row.get("url", "")),
@@ -348,13 +460,85 @@ def save_repo_score(run_id, row):
         strengths_text,
         weaknesses_text,
         str(row.get("notes", "")),
-    ))
+    )
 
-    conn.commit()
-    conn.close()
+
+def save_repo_score(run_id, row, conn=None):
+    """
+    Save one repo score row to repo_scores.
+
+    The 'row' dict is produced by app.py batch scoring.
+    Expected keys:
+      repo, url, language,
+      total_score, llm_skill_score, hard_score,
+      activity_score, popularity_score, health_score,
+      strengths (list), weaknesses (list), notes (string)
+
+    Storage choice:
+    - strengths/weaknesses are lists in Python, but SQLite does not store lists.
+      I store them as JSON TEXT (e.g. ["clear README","has tests"]) so they come
+      back as lists. Rows saved by older versions used newline-separated text;
+      _text_to_list reads both.
+    """
+    with _use_conn(conn) as conn:
+        conn.execute(_INSERT_REPO_SCORE_SQL, _repo_score_params(run_id, row))
+        conn.commit()
 
 
-def get_recent_runs(limit=10):
+def save_repo_scores(run_id, rows, conn=None):
+    """
+    Save many repo score rows for one run in a single transaction.
+
+    Same row format as save_repo_score(). The difference is speed: one
+    executemany() and ONE commit for the whole batch, instead of a separate
+    INSERT + commit (and disk flush) per repo.
+    rows can be any iterable; the parameter tuples are produced lazily.
+    """
+    with _use_conn(conn) as conn:
+        # "with conn" wraps everything in one transaction (commit at the end,
+        # rollback if any row fails, so a run is never half-saved).
+        with conn:
+            conn.executemany(
+                _INSERT_REPO_SCORE_SQL,
+                (_repo_score_params(run_id, row) for row in rows),
+            )
+
+
+def save_repo_metadata(run_id, repo_rows, notes="", conn=None):
+    """
+    Save repos for one run WITHOUT scores (the CLI's "analytics only" save).
+
+    repo_rows are build_repo_rows() rows (name, html_url, language). Only those
+    three fields are read; every score column is NULL, strengths/weaknesses
+    are empty lists, and every row gets the same notes text.
+
+    Why not save_repo_scores():
+    that one expects a full scoring dict per repo, so the CLI had to build a
+    12-key dict for each repo just to have it unpacked again here. This builds
+    the INSERT parameter tuples straight from the three columns it needs.
+    Same single executemany() + one transaction as save_repo_scores().
+    """
+    run_id = int(run_id)
+    notes = str(notes)
+    params = [
+        (
+            run_id,
+            str(rr.get("name", "")),
+            str(rr.get("html_url", "")),
+            str(rr.get("language", "")),
+            None, None, None, None, None, None,  # total/llm/hard/activity/popularity/health
+            "[]", "[]",                          # strengths, weaknesses (compact JSON)
+            notes,
+        )
+        for rr in repo_rows
+    ]
+
+    with _use_conn(conn) as conn:
+        with conn:
+            conn.executemany(_INSERT_REPO_SCORE_SQL, params)
+
+
+def get_recent_runs(limit=10, conn=None):
     """
     Return the most recent run records.
 
@@ -365,44 +549,83 @@ def get_recent_runs(limit=10):
     - COALESCE(created_at, '') keeps the query from failing if created_at is NULL
       in an older DB before migration.
     """
-    init_db()
+    with _use_conn(conn) as conn:
+        cur = conn.cursor()
 
-    conn = get_conn()
-    cur = conn.cursor()
-
-    cur.execute("""
-    SELECT COALESCE(created_at, '') AS created_at, username, repo_count, id
-    FROM runs
-    ORDER BY id DESC
-    LIMIT ?
-    """, (int(limit),))
+        cur.execute("""
+        SELECT COALESCE(created_at, '') AS created_at, username, repo_count, id
+        FROM runs
+        ORDER BY id DESC
+        LIMIT ?
+        """, (int(limit),))
 
-    rows = cur.fetchall()
-    conn.close()
+        rows = cur.fetchall()
     return rows
 
 
-def get_run_repo_scores(run_id):
+# Columns are aliased to the names app.py shows (repo_url becomes "Link", the
+# column the history table renders as a clickable link), so the DataFrame
+# version needs no renaming afterwards.
+_RUN_REPO_SCORES_SQL = """
+SELECT repo_name AS repo, repo_url AS "Link", language,
+       total_score, llm_skill_score, hard_score,
+       activity_score, popularity_score, health_score,
+       strengths, weaknesses, notes
+FROM repo_scores
+WHERE run_id = ?
+ORDER BY total_score DESC
+"""
+
+
+def _text_to_list(text):
+    """
+    Turn a stored strengths/weaknesses value back into a list of strings.
+
+    New rows hold JSON ("[...]"); rows saved by older versions hold the items
+    joined with newlines, so anything that isn't a JSON list of strings is split
+    on lines (an old row can start with "[" too, like "[WIP] add tests").
+    """
+    if not text:
+        return []
+    if text.startswith("["):
+        try:
+            items = json.loads(text)
+        except ValueError:
+            items = None
+        if isinstance(items, list) and all(isinstance(x, str) for x in items):
+            return items
+    return text.split("\n")
+
+
+def get_run_repo_scores(run_id, conn=None):
     """
     Return all repo_scores rows for a given run_id.
 
     Output columns match what app.py expects when displaying history.
+    strengths/weaknesses are the stored text (see _text_to_list to decode them).
     """
-    init_db()
+    with _use_conn(conn) as conn:
+        cur = conn.cursor()
+        cur.execute(_RUN_REPO_SCORES_SQL, (int(run_id),))
+        rows = cur.fetchall()
+    return rows
 
-    conn = get_conn()
-    cur = conn.cursor()
 
-    cur.execute("""
-    SELECT repo_name, repo_url, language,
-           total_score, llm_skill_score, hard_score,
-           activity_score, popularity_score, health_score,
-           strengths, weaknesses, notes
-    FROM repo_scores
-    WHERE run_id = ?
-    ORDER BY total_score DESC
-    """, (int(run_id),))
+def get_run_repo_scores_df(run_id, conn=None):
+    """
+    Same rows as get_run_repo_scores(), but as a pandas DataFrame.
 
-    rows = cur.fetchall()
-    conn.close()
-    return rows
\ No newline at end of file
+    pandas.read_sql_query fills each column directly, so the app doesn't build
+    a Python tuple per row and then transpose them into columns itself.
+    Column names come from the aliases in _RUN_REPO_SCORES_SQL.
+    strengths/weaknesses are decoded back into lists.
+    """
+    # pandas is only needed by the Streamlit app, so the CLI doesn't pay for importing it.
+    import pandas as pd
+
+    with _use_conn(conn) as conn:
+        df = pd.read_sql_query(_RUN_REPO_SCORES_SQL, conn, params=(int(run_id),))
+
+    for col in ("strengths", "weaknesses"):
+        df[col] = [_text_to_list(v) for v in df[col]]
+    return df
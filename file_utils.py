@@ -16,6 +16,7 @@ import os                      # File paths + existence checks
 import csv                     # Write CSV files (built-in)
 import json                    # Write JSON files (built-in)
 from datetime import datetime  # Timestamp for filenames
+from itertools import chain    # Put the first CSV row back in front of the rest
 
 REPORTS_DIR = "reports"        # Folder to store all outputs
 
@@ -32,17 +33,19 @@ def ensure_reports_dir():
     os.makedirs(REPORTS_DIR, exist_ok=True)
 
 
-def _timestamp():
+def export_timestamp():
     """
     Return a timestamp string for filenames.
 
     Example: 20260228_014512
     I use timestamps so exports don't overwrite previous runs.
+    Callers that save several files for one run can call this once and pass
+    the result as ts= to each save function, so all files share one timestamp.
     """
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
 
-def save_report(username, summary, top_repos, top_langs):
+def save_report(username, summary, top_repos, top_langs, ts=None):
     """
     Save a human-readable TXT report.
     Returns the saved file path.
@@ -53,40 +56,49 @@ def save_report(username, summary, top_repos, top_langs):
     """
     ensure_reports_dir()
 
-    ts = _timestamp()
+    ts = ts or export_timestamp()
     path = os.path.join(REPORTS_DIR, f"{username}_report_{ts}.txt")
 
-    # "with open" closes the file automatically when the block ends
+    # I collect every line in a list and write the file once at the end,
+    # instead of calling f.write() for each line.
+    # Header lines
+    lines = [
+        "GitHub Activity Analyzer Report",
+        f"Username: {username}",
+        f"Generated: {ts}",
+        "",
+    ]
+
+    # Summary section (dictionary loop)
+    lines.append("SUMMARY")
+    lines.extend(f"- {k}: {v}" for k, v in summary.items())
+
+    # Top repos section
+    lines.append("")
+    lines.append("TOP REPOS (by stars)")
+    for r in top_repos:
+        # .get() prevents KeyError if a field is missing
+        name = r.get("name", "")
+        stars = r.get("stargazers_count", 0)
+        url = r.get("html_url", "")
+        lines.append(f"- {name} | stars={stars} | {url}")
+
+    # Languages section
+    lines.append("")
+    lines.append("TOP LANGUAGES")
+    # row is a dict like {"language": "Python", "repo_count": 3}
+    lines.extend(f"- {row['language']}: {row['repo_count']}" for row in top_langs)
+
+    # "with open" closes the file automatically when the block ends.
+    # The trailing "" gives the file its final newline, like before.
+    lines.append("")
     with open(path, "w", encoding="utf-8") as f:
-        # Header lines
-        f.write("GitHub Activity Analyzer Report\n")
-        f.write(f"Username: {username}\n")
-        f.write(f"Generated: {ts}\n\n")
-
-        # Summary section (dictionary loop)
-        f.write("SUMMARY\n")
-        for k, v in summary.items():
-            f.write(f"- {k}: {v}\n")
-
-        # Top repos section
-        f.write("\nTOP REPOS (by stars)\n")
-        for r in top_repos:
-            # .get() prevents KeyError if a field is missing
-            name = r.get("name", "")
-            stars = r.get("stargazers_count", 0)
-            url = r.get("html_url", "")
-            f.write(f"- {name} | stars={stars} | {url}\n")
-
-        # Languages section
-        f.write("\nTOP LANGUAGES\n")
-        for row in top_langs:
-            # row is a dict like {"language": "Python", "repo_count": 3}
-            f.write(f"- {row['language']}: {row['repo_count']}\n")
+        f.write("\n".join(lines))
 
     return path
 
 
-def save_summary_json(username, summary):
+def save_summary_json(username, summary, ts=None):
     """
     Save the summary dictionary as JSON.
     Returns the saved file path.
@@ -97,7 +109,7 @@ def save_summary_json(username, summary):
     """
     ensure_reports_dir()
 
-    ts = _timestamp()
+    ts = ts or export_timestamp()
     path = os.path.join(REPORTS_DIR, f"{username}_summary_{ts}.json")
 
     # json.dump writes Python dict -> JSON text
@@ -107,66 +119,87 @@ def save_summary_json(username, summary):
     return path
 
 
-def save_repos_csv(username, repo_rows):
+def save_repos_csv(username, repo_rows, ts=None):
     """
     Save repo rows (list of dicts) as CSV.
     Returns the saved file path.
 
     repo_rows is produced by analytics.build_repo_rows(repos, username)
     and looks like a list of dictionaries, where each dict is one repo.
+    Any iterable of row dicts works too (for example the generator from
+    analytics.iter_repo_rows), so rows can be streamed straight to disk.
     """
     ensure_reports_dir()
 
-    ts = _timestamp()
+    ts = ts or export_timestamp()
     path = os.path.join(REPORTS_DIR, f"{username}_repos_{ts}.csv")
 
+    # Pull the first row out so I know the headers (works for lists and generators).
+    rows = iter(repo_rows or [])
+    first = next(rows, None)
+
     # If repo_rows is empty, still create an empty CSV file (safe behavior)
-    if not repo_rows:
+    if first is None:
         with open(path, "w", newline="", encoding="utf-8") as f:
             f.write("")
         return path
 
     # CSV headers should be consistent across rows.
     # I grab the keys from the first row dict.
-    fieldnames = list(repo_rows[0].keys())
-
+    fieldnames = list(first.keys())
+
+    # csv.DictWriter matches each row's keys to the header:
+    # - a row missing a column gets a blank cell (restval="")
+    # - a row with an unexpected key raises ValueError (extrasaction="raise"),
+    #   so a wrong field list fails loudly instead of writing a truncated CSV
+    # (I didn't use pandas.to_csv: the CLI doesn't import pandas otherwise, and
+    # loading it would cost more than writing a few hundred rows.)
     # newline="" prevents extra blank lines on Windows
     with open(path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer = csv.DictWriter(f, fieldnames=fieldnames, restval="", extrasaction="raise")
 
         # First line of CSV is the header row
         writer.writeheader()
 
-        # Write each repo row (dict) as one line in the CSV
-        for row in repo_rows:
-            writer.writerow(row)
+        # Write each repo row as one line in the CSV (first row, then the rest)
+        writer.writerows(chain([first], rows))
 
     return path
 
 
-def load_usernames(path="usernames.txt"):
+def iter_usernames(path="usernames.txt"):
     """
-    Load GitHub usernames from a text file (one per line).
-    Returns a list of strings.
+    Yield GitHub usernames from a text file (one per line), one at a time.
+
+    This is a generator, so the file is read lazily: the caller can start
+    analyzing the first username without the whole list being built first.
+    Blank lines are skipped.
 
     Expected file format:
       torvalds
       google
       openai
     """
-    # If the file doesn't exist, print an error and return empty list
-    # Returning [] is safer than crashing.
+    # If the file doesn't exist, print an error and yield nothing.
+    # Returning nothing is safer than crashing.
     if not os.path.exists(path):
         print(f"Error: file not found: {path}")
-        return []
-
-    usernames = []
+        return
 
     # Read the file line by line
     with open(path, "r", encoding="utf-8") as f:
         for line in f:
-            u = line.strip()  # remove whitespace/newlines
-            if u != "":
-                usernames.append(u)  # only keep non-empty lines
+            # I still strip both sides (not just the newline): GitHub usernames
+            # can't contain spaces, so a stray space from an editor would only
+            # turn into a failed API call.
+            u = line.strip()
+            if u:
+                yield u
 
-    return usernames
\ No newline at end of file
+
+def load_usernames(path="usernames.txt"):
+    """
+    Load GitHub usernames from a text file (one per line).
+    Returns a list of strings (see iter_usernames for the streaming version).
+    """
+    return list(iter_usernames(path))
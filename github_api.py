@@ -12,17 +12,29 @@
 #
 # Main features in this file:
 # 1) Token support (higher GitHub rate limits)
-# 2) A simple JSON file cache (so I don't spam the API while testing)
+# 2) A response cache (so I don't spam the API while testing)
 # 3) fetch_repos(): paginated fetch of user repos
 # 4) fetch_repo_sample(): fetch README + a small code sample to send to the LLM
+#    (GraphQL when a token is set, REST otherwise)
 
 import os
 import base64
-import time
 import json
 import hashlib
+from concurrent.futures import ThreadPoolExecutor  # Download several files at once
+from urllib.parse import quote, urlparse, parse_qs  # Raw URL escaping; page numbers in Link headers
 from datetime import datetime  # (not required by core logic, but useful for debugging / future logs)
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from cache_utils import cache_get, cache_set
+
+# Optional: orjson parses the JSON responses several times faster than resp.json().
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # ----------------------------
 # Config
@@ -44,18 +56,79 @@ if GITHUB_TOKEN:
 # Default cache directory for API responses.
 CACHE_DIR_DEFAULT = "cache"
 
+# How many files fetch_repo_sample downloads (keeps prompt size manageable).
+MAX_SAMPLE_FILES = 8
+
+# File types worth sampling (text/code), as bare extensions so the tree loop
+# can do one set lookup per file. (requirements.txt / package.json are covered
+# by txt / json.)
+_GOOD_EXT = frozenset({
+    "py", "md", "txt", "json", "yml", "yaml",
+    "toml", "ini", "cfg",
+    "js", "ts", "html", "css",
+})
+
+# Entry point file names that get sampled before other files (like READMEs do).
+_PRIORITY_FILES = frozenset({"main.py", "app.py", "index.js"})
+
+# How much of each README / sampled file fetch_repo_sample keeps.
+# The LLM prompt only uses the first 2000 characters of each, so downloading,
+# decoding and caching a whole 200 KB file was wasted work. 8 KB still covers
+# 2000 characters even if every character is multi-byte UTF-8, and leaves the
+# "minified file" check in llm_utils some text to look at.
+SAMPLE_MAX_BYTES = 8192
+
+
+# GitHub's GraphQL endpoint (only usable with a token, see fetch_repo_sample_graphql)
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+# How many folder levels the GraphQL tree query walks (root = 1). GraphQL can't
+# ask for "the whole tree recursively", so the query nests this many levels.
+# Repos with deeper folders fall back to the REST recursive tree.
+GRAPHQL_TREE_DEPTH = 4
 
 # ----------------------------
-# Simple file cache helpers
+# Shared HTTP session
 # ----------------------------
-def _ensure_dir(path):
-    """
-    Make sure a folder exists before writing cache files into it.
-    exist_ok=True prevents crashing if it already exists.
-    """
-    os.makedirs(path, exist_ok=True)
+# One requests.Session for every GitHub call. The session keeps connections open
+# (keep-alive), so a batch of README/code fetches reuses a few TLS connections
+# instead of doing a new handshake for every single request.
+# - pool_maxsize=20 leaves room for the app's scoring threads to share the pool
+# - Retry re-tries short-lived server errors (502/503/504) with a small backoff
+_SESSION = requests.Session()
+_SESSION.headers.update(BASE_HEADERS)
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=("GET",),
+            raise_on_status=False,  # after the last retry, hand back the response so _get reports the status
+        ),
+    ),
+)
+
+
+# Shared worker threads for the per-file downloads in fetch_repo_sample.
+# It's module-wide (not one pool per call) so the total number of parallel
+# GitHub requests stays bounded even when the app scores several repos at once;
+# GitHub's secondary rate limits punish bursts of concurrent requests.
+CONTENT_FETCH_WORKERS = 6
+_FETCH_POOL = ThreadPoolExecutor(max_workers=CONTENT_FETCH_WORKERS, thread_name_prefix="github-fetch")
 
 
+# ----------------------------
+# Cache helpers
+# ----------------------------
+# API responses go through cache_utils, the same cache the LLM results use:
+# one SQLite file per cache folder (cache/cache.sqlite) plus a small in-memory
+# layer, instead of one JSON file per response. (Older cache/<sha256>.json files
+# were written under SHA256 keys; they no longer match and just go unused, and
+# they were only fresh for cache_minutes anyway.)
 def _cache_key(prefix, url, params):
     """
     Build a stable cache key from:
@@ -63,93 +136,84 @@ def _cache_key(prefix, url, params):
       - URL
       - params (sorted so ordering does not change the hash)
     Then hash it so filenames are short and safe.
-    """
-    raw = prefix + "|" + url + "|" + json.dumps(params or {}, sort_keys=True)
-    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
-
 
-def _cache_path(cache_dir, key):
+    BLAKE2b with a 16-byte digest (like cache_utils' keys): faster than SHA256,
+    and cache keys only need to be unique, not cryptographically secure.
     """
-    Convert a cache key into an on-disk path like:
-      cache/<sha256>.json
-    """
-    return os.path.join(cache_dir, f"{key}.json")
+    raw = prefix + "|" + url + "|" + json.dumps(params or {}, sort_keys=True)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
 
 
 def _cache_get(cache_dir, key, cache_minutes):
     """
-    Try to load cached JSON from disk.
+    Try to load a cached response.
     Returns:
       - Python object if found and not expired
       - None if missing or expired or unreadable
     """
-    path = _cache_path(cache_dir, key)
+    return cache_get(cache_dir, key, cache_minutes)
 
-    # If the file doesn't exist, it's a cache miss.
-    if not os.path.exists(path):
-        return None
 
-    # Check the age of the cache file using the file modification time.
-    age_seconds = time.time() - os.path.getmtime(path)
-
-    # If it is older than our TTL, ignore it (treat as miss).
-    if age_seconds > cache_minutes * 60:
-        return None
-
-    # If it's fresh enough, try reading JSON.
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        # If parsing fails, treat it as a miss.
-        return None
-
-
-def _cache_set(cache_dir, key, obj):
+def _cache_set(cache_dir, key, obj, json_bytes=None):
     """
-    Save a Python object to disk as JSON.
+    Save a response to the cache.
+    json_bytes is the response body, if I have it: it gets stored as-is instead
+    of turning obj back into JSON (see cache_utils.cache_set).
     I keep this best-effort (no crashing if write fails).
     """
-    _ensure_dir(cache_dir)
-    path = _cache_path(cache_dir, key)
+    cache_set(cache_dir, key, obj, json_bytes=json_bytes)
 
-    try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(obj, f)
-    except Exception:
-        # Cache failures should not break the app.
-        pass
 
-
-def _get(url, params=None, timeout=20, use_cache=False, cache_minutes=30, cache_dir=CACHE_DIR_DEFAULT):
+def _get_with_links(url, params=None, timeout=20, use_cache=False, cache_minutes=30, cache_dir=CACHE_DIR_DEFAULT):
     """
-    Wrapper around requests.get() with optional caching.
+    Wrapper around a GET on the shared session (_SESSION) with optional caching.
 
     Returns:
-      (json_data, error_string)
+      (json_data, error_string, links)
 
     - json_data is a Python dict/list if successful
     - error_string is a human-readable message if something failed
+    - links is the parsed HTTP Link header (requests' resp.links, e.g.
+      {"next": {"url": ...}, "last": {"url": ...}}), used for pagination.
+      It is None when the answer came from the cache (or a 304) or the request failed.
     """
     # 1) Cache check (if enabled)
+    stale = None
+    headers = None
     if use_cache:
         key = _cache_key("GET", url, params)
         hit = _cache_get(cache_dir, key, cache_minutes)
         if hit is not None:
-            return hit, None
+            return hit, None, None
+
+        # Expired? If I still have the old body and its ETag, ask GitHub to only
+        # send the body if it changed (If-None-Match). An unchanged answer is a
+        # tiny 304 instead of the full JSON again.
+        etag_key = _cache_key("ETAG", url, params)
+        stale = _cache_get(cache_dir, key, None)
+        etag = _cache_get(cache_dir, etag_key, None) if stale is not None else None
+        if etag:
+            headers = {"If-None-Match": etag}
 
     # 2) Make the HTTP request
     try:
-        resp = requests.get(url, headers=BASE_HEADERS, params=params, timeout=timeout)
+        resp = _SESSION.get(url, params=params, headers=headers, timeout=timeout)
     except requests.RequestException as e:
         # This catches timeouts, DNS issues, no internet, etc.
-        return None, f"Network error calling GitHub API: {e}"
+        return None, f"Network error calling GitHub API: {e}", None
+
+    # 304 Not Modified: the cached body is still current. Writing it again
+    # restarts its cache_minutes. (No links: a 304 may not repeat the Link
+    # header, so callers treat this like a cache hit.)
+    if resp.status_code == 304 and stale is not None:
+        _cache_set(cache_dir, key, stale)
+        return stale, None, None
 
     # 3) Handle common HTTP error codes
     if resp.status_code == 404:
-        return None, "Not found (404)."
+        return None, "Not found (404).", None
     if resp.status_code == 401:
-        return None, "Unauthorized (401). Check your GITHUB_TOKEN."
+        return None, "Unauthorized (401). Check your GITHUB_TOKEN.", None
     if resp.status_code == 403:
         # 403 commonly means rate limiting. GitHub often includes a message in JSON.
         msg = ""
@@ -157,27 +221,200 @@ def _get(url, params=None, timeout=20, use_cache=False, cache_minutes=30, cache_
             msg = resp.json().get("message", "")
         except Exception:
             msg = ""
-        return None, f"Forbidden / rate limited (403). {msg}"
+        return None, f"Forbidden / rate limited (403). {msg}", None
     if resp.status_code != 200:
         # Anything else non-200 is a generic API error.
-        return None, f"GitHub API error: status {resp.status_code}"
+        return None, f"GitHub API error: status {resp.status_code}", None
 
     # 4) Parse JSON response body into Python structures
+    # (orjson.JSONDecodeError is a ValueError subclass, like json's)
+    try:
+        data = orjson.loads(resp.content) if orjson is not None else resp.json()
+    except ValueError:
+        return None, "GitHub response was not valid JSON.", None
+
+    # 5) Save to cache (if enabled). The body is already JSON, so I store those
+    # bytes directly rather than serializing data again.
+    # The ETag (if GitHub sent one) is kept next to it for the next revalidation.
+    if use_cache:
+        _cache_set(cache_dir, key, data, json_bytes=resp.content)
+        new_etag = resp.headers.get("ETag")
+        if new_etag:
+            _cache_set(cache_dir, etag_key, new_etag)
+
+    return data, None, resp.links
+
+
+def _get(url, params=None, timeout=20, use_cache=False, cache_minutes=30, cache_dir=CACHE_DIR_DEFAULT):
+    """
+    Same as _get_with_links, for the (many) callers that don't need the links.
+
+    Returns:
+      (json_data, error_string)
+    """
+    data, err, _ = _get_with_links(
+        url,
+        params=params,
+        timeout=timeout,
+        use_cache=use_cache,
+        cache_minutes=cache_minutes,
+        cache_dir=cache_dir
+    )
+    return data, err
+
+
+def _get_raw(url, timeout=20, use_cache=False, cache_minutes=30, cache_dir=CACHE_DIR_DEFAULT, max_bytes=None):
+    """
+    GET a raw file (raw.githubusercontent.com) and return it as text.
+
+    Same (result, error_string) shape and cache as _get, but the body is plain
+    file bytes: no JSON wrapper and no base64 to decode.
+
+    max_bytes: if set, only the first max_bytes bytes are requested (HTTP Range
+    header, answered with 206 Partial Content) and kept.
+    """
+    if use_cache:
+        key = _cache_key("RAW", url, {"max_bytes": max_bytes} if max_bytes else None)
+        hit = _cache_get(cache_dir, key, cache_minutes)
+        if hit is not None:
+            return hit, None
+
+    # With a Range, ask for the file uncompressed ("identity"): a byte range of a
+    # gzipped body would be a cut-off gzip stream that can't be decoded.
+    headers = {"Range": f"bytes=0-{max_bytes - 1}", "Accept-Encoding": "identity"} if max_bytes else None
+    try:
+        resp = _SESSION.get(url, headers=headers, timeout=timeout)
+    except requests.RequestException as e:
+        return None, f"Network error fetching raw file: {e}"
+
+    if resp.status_code not in (200, 206):
+        return None, f"Raw file error: status {resp.status_code}"
+
+    # Slice too, in case the server ignored the Range header and sent everything.
+    body = resp.content[:max_bytes] if max_bytes else resp.content
+    text = body.decode("utf-8", errors="replace")
+
+    if use_cache:
+        _cache_set(cache_dir, key, text)
+
+    return text, None
+
+
+def _post_graphql(query, variables, timeout=20, use_cache=False, cache_minutes=30, cache_dir=CACHE_DIR_DEFAULT):
+    """
+    POST one GraphQL query to GitHub, with the same caching as _get.
+
+    Returns:
+      (data, error_string)
+
+    - data is the "data" part of the answer
+    - GraphQL reports problems (missing repo, bad query) in an "errors" list
+      with status 200, so those count as errors here too (and aren't cached)
+    """
+    payload = {"query": query, "variables": variables}
+
+    if use_cache:
+        key = _cache_key("POST", GRAPHQL_URL, payload)
+        hit = _cache_get(cache_dir, key, cache_minutes)
+        if hit is not None:
+            return hit, None
+
+    try:
+        resp = _SESSION.post(GRAPHQL_URL, json=payload, timeout=timeout)
+    except requests.RequestException as e:
+        return None, f"Network error calling GitHub GraphQL: {e}"
+
+    if resp.status_code != 200:
+        return None, f"GitHub GraphQL error: status {resp.status_code}"
+
     try:
-        data = resp.json()
+        body = orjson.loads(resp.content) if orjson is not None else resp.json()
     except ValueError:
-        return None, "GitHub response was not valid JSON."
+        return None, "GitHub GraphQL response was not valid JSON."
+
+    if not isinstance(body, dict):
+        return None, "Unexpected GitHub GraphQL response."
+    if body.get("errors"):
+        first = body["errors"][0] or {}
+        return None, f"GitHub GraphQL error: {first.get('message', 'unknown error')}"
+
+    data = body.get("data")
+    if not isinstance(data, dict):
+        return None, "Unexpected GitHub GraphQL response."
 
-    # 5) Save to cache (if enabled)
     if use_cache:
         _cache_set(cache_dir, key, data)
 
     return data, None
 
 
+def _b64_decode_text(content_b64, max_bytes=None):
+    """
+    Decode the base64 "content" field of a GitHub contents/readme response to text.
+
+    With max_bytes, only the base64 characters needed for the first max_bytes
+    bytes are decoded (every 4 base64 chars = 3 bytes), not the whole file.
+    GitHub wraps the base64 text in newlines, so those are removed first.
+    """
+    if max_bytes:
+        content_b64 = content_b64.replace("\n", "")[: -(-max_bytes // 3) * 4]
+        data = base64.b64decode(content_b64)[:max_bytes]
+    else:
+        data = base64.b64decode(content_b64)
+    return data.decode("utf-8", errors="replace")
+
+
+def _get_b64_text(url, timeout=20, use_cache=False, cache_minutes=30, cache_dir=CACHE_DIR_DEFAULT, max_bytes=None):
+    """
+    GET a /readme or /contents response and return its file text, decoded from
+    base64 and cut to max_bytes (see _b64_decode_text).
+
+    Same (result, error_string) shape as _get, but what goes into the cache is
+    only the clipped text, never the whole JSON response: these APIs can't be
+    asked for part of a file, so the full base64 body still comes over the wire,
+    but a 200 KB README is no longer JSON-parsed back out of the cache and kept
+    there in full when the LLM only sees its first few KB.
+    """
+    if use_cache:
+        key = _cache_key("B64TEXT", url, {"max_bytes": max_bytes} if max_bytes else None)
+        hit = _cache_get(cache_dir, key, cache_minutes)
+        if hit is not None:
+            return hit, None
+
+    data, err = _get(url, timeout=timeout, use_cache=False)
+    if err:
+        return None, err
+    if not isinstance(data, dict) or not data.get("content"):
+        return None, "No file content in GitHub response."
+
+    try:
+        text = _b64_decode_text(data["content"], max_bytes)
+    except Exception:
+        return None, "Could not decode file content."
+
+    if use_cache:
+        _cache_set(cache_dir, key, text)
+
+    return text, None
+
+
+
 # ----------------------------
 # Core API functions
 # ----------------------------
+def _page_number(link):
+    """
+    Read the page=N number out of one entry of resp.links (e.g. links["last"]).
+    Returns None if it isn't there.
+    """
+    url = (link or {}).get("url", "")
+    pages = parse_qs(urlparse(url).query).get("page")
+    try:
+        return int(pages[0]) if pages else None
+    except ValueError:
+        return None
+
+
 def fetch_repos(username, per_page=100, max_pages=10, use_cache=True, cache_minutes=30, cache_dir="cache"):
     """
     Fetch public repos for a GitHub username.
@@ -188,30 +425,32 @@ def fetch_repos(username, per_page=100, max_pages=10, use_cache=True, cache_minu
 
     Why pagination:
       GitHub returns repos in pages. per_page is max 100.
-      I loop pages until:
-        - I hit max_pages, OR
-        - I get an empty page, OR
-        - I get fewer than per_page repos (meaning last page)
+
+    How I page through them:
+      - Page 1 is fetched first. GitHub's Link header says whether there is a
+        next page and which page is the last one.
+      - No "next" link: page 1 was everything (the usual case), so I stop,
+        even if it held exactly per_page repos.
+      - Otherwise pages 2..last (capped at max_pages) are fetched in parallel
+        on the shared pool instead of one after another.
+      - If page 1 came from the cache there are no headers, so I fall back to
+        the old loop: next page until an empty or short page, or max_pages.
     """
     username = (username or "").strip()
     if username == "":
         print("Error: username cannot be empty.")
         return []
 
-    all_repos = []  # this will grow as I fetch each page
-    page = 1        # start at page 1
-
-    while page <= max_pages:
-        url = f"https://api.github.com/users/{username}/repos"
+    url = f"https://api.github.com/users/{username}/repos"
 
+    def _fetch_page(page):
         params = {
             "per_page": per_page,
             "page": page,
             "sort": "pushed",        # I want most recently pushed repos first
             "direction": "desc",
         }
-
-        data, err = _get(
+        return _get_with_links(
             url,
             params=params,
             use_cache=use_cache,
@@ -219,14 +458,52 @@ def fetch_repos(username, per_page=100, max_pages=10, use_cache=True, cache_minu
             cache_dir=cache_dir
         )
 
-        # If any error happens, return [] so the UI can show a message.
+    def _check(data, err):
+        """Print the error (if any) and return True when the page is usable."""
+        # If any error happens, the caller returns [] so the UI can show a message.
         if err:
             print(f"Error fetching repos: {err}")
-            return []
+            return False
 
         # GitHub should return a list here (one dict per repo).
         if not isinstance(data, list):
             print("Error: unexpected response format for repos.")
+            return False
+        return True
+
+    if max_pages < 1:
+        return []
+
+    data, err, links = _fetch_page(1)
+    if not _check(data, err):
+        return []
+
+    all_repos = list(data)  # this will grow as I fetch each page
+
+    # Empty or short page 1 means there are no more pages.
+    if len(data) < per_page or max_pages == 1:
+        return all_repos
+
+    if links is not None:
+        # Fresh response: trust the Link header.
+        if "next" not in links:
+            return all_repos
+
+        last = _page_number(links.get("last")) or max_pages
+        pages = range(2, min(last, max_pages) + 1)
+
+        # map() keeps page order, so repos stay sorted by most recent push.
+        for data, err, _ in _FETCH_POOL.map(_fetch_page, pages):
+            if not _check(data, err):
+                return []
+            all_repos.extend(data)
+        return all_repos
+
+    # Page 1 came from the cache (no headers): walk the pages one by one.
+    page = 2
+    while page <= max_pages:
+        data, err, _ = _fetch_page(page)
+        if not _check(data, err):
             return []
 
         # Empty list means no more pages.
@@ -246,65 +523,16 @@ def fetch_repos(username, per_page=100, max_pages=10, use_cache=True, cache_minu
     return all_repos
 
 
-def fetch_repo_sample(owner, repo, use_cache=True, cache_minutes=30, cache_dir="cache"):
+def _tree_sha_for_branch(owner, repo, branch, use_cache, cache_minutes, cache_dir):
     """
-    Fetch a small sample of a repository to send to the LLM.
-
-    Returns:
-      (readme_text, code_files)
-
-    where code_files is a list like:
-      [{"path": "README.md", "content": "..."},
-       {"path": "src/main.py", "content": "..."}, ...]
+    Find the root tree SHA of a branch the long way: branch -> commit -> tree.
+    Returns the SHA, or None if any step fails.
 
-    Strategy:
-    - Fetch repo metadata to get the default branch
-    - Fetch README using the /readme endpoint (best-effort)
-    - Fetch a recursive git tree from the default branch commit
-    - Choose a small set of "good" text/code files (avoid huge and binary)
-    - Download content for those files via the contents API
+    fetch_repo_sample only uses this as a fallback when asking the trees
+    endpoint for the branch name directly doesn't work.
     """
-    owner = (owner or "").strip()
-    repo = (repo or "").strip()
-    if owner == "" or repo == "":
-        return "", []
-
-    # 1) Repo metadata (needed to find default_branch reliably)
-    repo_url = f"https://api.github.com/repos/{owner}/{repo}"
-    repo_data, err = _get(
-        repo_url,
-        use_cache=use_cache,
-        cache_minutes=cache_minutes,
-        cache_dir=cache_dir
-    )
-
-    # If the repo doesn't exist / is private / API fails, return empty sample.
-    if err or not isinstance(repo_data, dict):
-        return "", []
-
-    default_branch = repo_data.get("default_branch", "main")
-
-    # 2) README text (best effort)
-    readme_text = ""
-    readme_url = f"https://api.github.com/repos/{owner}/{repo}/readme"
-    readme_data, readme_err = _get(
-        readme_url,
-        use_cache=use_cache,
-        cache_minutes=cache_minutes,
-        cache_dir=cache_dir
-    )
-
-    # README endpoint returns base64 content inside a dict.
-    if not readme_err and isinstance(readme_data, dict):
-        content_b64 = readme_data.get("content", "")
-        if content_b64:
-            try:
-                readme_text = base64.b64decode(content_b64).decode("utf-8", errors="replace")
-            except Exception:
-                readme_text = ""
-
-    # 3) Get tree SHA for default branch
-    branch_url = f"https://api.github.com/repos/{owner}/{repo}/branches/{default_branch}"
+    # Get the branch's latest commit SHA
+    branch_url = f"https://api.github.com/repos/{owner}/{repo}/branches/{branch}"
     branch_data, err = _get(
         branch_url,
         use_cache=use_cache,
@@ -312,14 +540,14 @@ def fetch_repo_sample(owner, repo, use_cache=True, cache_minutes=30, cache_dir="
         cache_dir=cache_dir
     )
     if err or not isinstance(branch_data, dict):
-        return readme_text, []
+        return None
 
     commit = branch_data.get("commit", {}) or {}
     commit_sha = commit.get("sha")
     if not commit_sha:
-        return readme_text, []
+        return None
 
-    # 4) Fetch commit details to find the tree SHA
+    # Fetch commit details to find the tree SHA
     commit_url = f"https://api.github.com/repos/{owner}/{repo}/git/commits/{commit_sha}"
     commit_data, err = _get(
         commit_url,
@@ -328,39 +556,29 @@ def fetch_repo_sample(owner, repo, use_cache=True, cache_minutes=30, cache_dir="
         cache_dir=cache_dir
     )
     if err or not isinstance(commit_data, dict):
-        return readme_text, []
+        return None
 
     tree = (commit_data.get("tree") or {})
-    tree_sha = tree.get("sha")
-    if not tree_sha:
-        return readme_text, []
+    return tree.get("sha")
 
-    # 5) Fetch git tree recursively (this gives a list of file paths)
-    tree_url = f"https://api.github.com/repos/{owner}/{repo}/git/trees/{tree_sha}"
-    tree_data, err = _get(
-        tree_url,
-        params={"recursive": "1"},
-        use_cache=use_cache,
-        cache_minutes=cache_minutes,
-        cache_dir=cache_dir
-    )
-    if err or not isinstance(tree_data, dict):
-        return readme_text, []
 
-    entries = tree_data.get("tree", []) or []
-    if not entries:
-        return readme_text, []
+def _choose_sample_paths(entries):
+    """
+    Pick which files of a repo tree are worth sampling (text/code, see _GOOD_EXT).
 
-    # 6) Decide which file types are worth sampling (text/code)
-    good_ext = (
-        ".py", ".md", ".txt", ".json", ".yml", ".yaml",
-        ".toml", ".ini", ".cfg",
-        ".js", ".ts", ".html", ".css"
-    )
+    entries: tree entries shaped like the REST git/trees response,
+      [{"type": "blob", "path": "src/main.py", "size": 1234}, ...]
 
+    Returns at most MAX_SAMPLE_FILES paths: READMEs and entry point files first,
+    then other useful files, each group in tree order.
+    """
     prioritized = []  # files I really want if they exist
     others = []       # other files that are still useful
 
+    # Only the first MAX_SAMPLE_FILES of (prioritized + others) get downloaded,
+    # so neither list needs to grow past that. On a huge monorepo tree this
+    # keeps both lists tiny, and once enough prioritized files are found, no
+    # later entry can change the result, so the loop stops.
     for e in entries:
         # Only "blob" entries are files. (Trees are folders.)
         if e.get("type") != "blob":
@@ -373,42 +591,325 @@ def fetch_repo_sample(owner, repo, use_cache=True, cache_minutes=30, cache_dir="
         if size > 200_000:  # 200KB
             continue
 
-        lower = path.lower()
+        # File name only (no folders), lowercased once, and its extension.
+        base = path.rpartition("/")[2].lower()
+        _, dot, ext = base.rpartition(".")
 
-        # Only include good extensions or key config files.
-        if lower.endswith(good_ext) or lower in ("requirements.txt", "package.json"):
+        # Only include good extensions.
+        if dot and ext in _GOOD_EXT:
             # Favor README and main entrypoint files.
-            if "readme" in lower or lower.endswith(("main.py", "app.py", "index.js")):
+            if "readme" in base or base in _PRIORITY_FILES:
                 prioritized.append(path)
-            else:
+                if len(prioritized) >= MAX_SAMPLE_FILES:
+                    break
+            elif len(others) < MAX_SAMPLE_FILES:
                 others.append(path)
 
     # Limit how many files I download (keeps prompt size manageable).
-    chosen_paths = (prioritized + others)[:8]
+    return (prioritized + others)[:MAX_SAMPLE_FILES]
 
-    # 7) Download content for chosen files using the contents API
-    code_files = []
-    for path in chosen_paths:
-        content_url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
-        file_data, err = _get(
-            content_url,
+
+def _fetch_sample_file(owner, repo, branch, path, use_cache, cache_minutes, cache_dir, max_bytes):
+    """
+    Download the first max_bytes of one file for the sample, as text.
+    Returns None if it couldn't be downloaded.
+
+    Both fetch_repo_sample paths (REST and GraphQL) use this, so file bodies are
+    always capped before they are cached.
+    """
+    # First try the raw file host: plain bytes (no JSON, no base64, ~25% less
+    # data), only the first max_bytes asked for (Range), and it doesn't count
+    # against the REST API rate limit.
+    raw_url = f"https://raw.githubusercontent.com/{owner}/{repo}/{quote(branch)}/{quote(path)}"
+    text, err = _get_raw(
+        raw_url,
+        use_cache=use_cache,
+        cache_minutes=cache_minutes,
+        cache_dir=cache_dir,
+        max_bytes=max_bytes
+    )
+    if not err:
+        return text
+
+    # Fallback: the contents API (e.g. if the raw host refuses the request)
+    content_url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
+    text, err = _get_b64_text(
+        content_url,
+        use_cache=use_cache,
+        cache_minutes=cache_minutes,
+        cache_dir=cache_dir,
+        max_bytes=max_bytes
+    )
+    return None if err else text
+
+
+def _graphql_tree_fields(depth):
+    """
+    Build the nested "entries { ... }" selection for the GraphQL tree query.
+    Files report their size and whether they're binary (but not their text, so
+    the listing stays small); folders nest one more level until depth runs out.
+    """
+    blob = "... on Blob { byteSize isBinary }"
+    if depth > 1:
+        blob += " ... on Tree { " + _graphql_tree_fields(depth - 1) + " }"
+    return "entries { name path type object { " + blob + " } }"
+
+
+_GRAPHQL_TREE_QUERY = (
+    "query($owner: String!, $name: String!) {"
+    " repository(owner: $owner, name: $name) {"
+    " defaultBranchRef { name }"
+    " object(expression: \"HEAD:\") { ... on Tree { "
+    + _graphql_tree_fields(GRAPHQL_TREE_DEPTH)
+    + " } } } }"
+)
+
+
+def _flatten_graphql_tree(entries, out):
+    """
+    Turn the nested GraphQL tree into flat entries shaped like the REST
+    recursive tree ({"type", "path", "size"}), in the same (depth-first) order.
+    Binary files are dropped here, since GraphQL already says which ones they are.
+    """
+    for e in entries or []:
+        obj = e.get("object") or {}
+        kind = e.get("type")
+        if kind == "blob":
+            if obj.get("isBinary"):
+                continue
+            out.append({"type": "blob", "path": e.get("path", ""), "size": obj.get("byteSize", 0)})
+        elif kind == "tree":
+            out.append({"type": "tree", "path": e.get("path", "")})
+            _flatten_graphql_tree(obj.get("entries"), out)
+    return out
+
+
+def _graphql_tree_truncated(entries):
+    """
+    True if the GraphQL tree stopped at GRAPHQL_TREE_DEPTH before a folder ended.
+
+    At the last level the query has no "... on Tree" part, so a folder there
+    comes back without an "entries" list (an empty folder deeper up has []).
+    """
+    for e in entries or []:
+        if e.get("type") != "tree":
+            continue
+        sub = (e.get("object") or {}).get("entries")
+        if sub is None or _graphql_tree_truncated(sub):
+            return True
+    return False
+
+
+def fetch_repo_sample_graphql(owner, repo, use_cache=True, cache_minutes=30, cache_dir="cache", max_bytes=SAMPLE_MAX_BYTES):
+    """
+    Same sample as fetch_repo_sample, through GitHub's GraphQL API.
+
+    Returns:
+      (readme_text, code_files) like fetch_repo_sample,
+      or None if GraphQL can't be used (no token, errors), so the caller can
+      fall back to the REST calls.
+
+    Why:
+      The REST path needs metadata (for the default branch), then the tree,
+      then the files. GraphQL gets the default branch AND the file tree (with
+      sizes and a binary flag) in ONE POST, which saves a round-trip.
+      The README and file bodies are then downloaded like in the REST path
+      (_fetch_sample_file: raw host with a Range header, in parallel), so only
+      their first max_bytes are downloaded and cached. Asking GraphQL for
+      Blob.text would send (and cache) every file in full.
+
+    Limits:
+      - GraphQL needs a token (GITHUB_TOKEN), anonymous requests are refused
+      - the tree query only walks GRAPHQL_TREE_DEPTH folder levels; if the repo
+        has deeper folders this returns None, so fetch_repo_sample uses the
+        REST recursive tree (no depth limit) and deep files can still be sampled
+    """
+    owner = (owner or "").strip()
+    repo = (repo or "").strip()
+    if owner == "" or repo == "" or not GITHUB_TOKEN:
+        return None
+
+    # 1) Default branch + file tree. No file text here on purpose (see Why).
+    data, err = _post_graphql(
+        _GRAPHQL_TREE_QUERY,
+        {"owner": owner, "name": repo},
+        use_cache=use_cache,
+        cache_minutes=cache_minutes,
+        cache_dir=cache_dir
+    )
+    if err:
+        return None
+
+    repository = data.get("repository")
+    if not isinstance(repository, dict):
+        return None
+
+    # Empty repo (no commits yet): there is no HEAD tree, and nothing to sample.
+    root = repository.get("object") or {}
+    root_entries = root.get("entries") or []
+    branch = (repository.get("defaultBranchRef") or {}).get("name")
+    if not root_entries or not branch:
+        return "", []
+
+    # Folders deeper than the query reaches: the listing is incomplete, so let
+    # the caller use the REST recursive tree instead of sampling only the top.
+    if _graphql_tree_truncated(root_entries):
+        return None
+
+    # The README is the first README-named file in the root folder
+    # (what the REST /readme endpoint usually picks, too).
+    readme_path = None
+    for e in root_entries:
+        if e.get("type") == "blob" and (e.get("name") or "").lower().startswith("readme"):
+            readme_path = e.get("path")
+            break
+
+    chosen_paths = _choose_sample_paths(_flatten_graphql_tree(root_entries, []))
+
+    # 2) README + chosen files, in parallel on the shared pool, each capped
+    # at max_bytes before it's cached. map() keeps the order.
+    wanted = list(chosen_paths)
+    if readme_path and readme_path not in wanted:
+        wanted.append(readme_path)
+
+    def _fetch_one(path):
+        return _fetch_sample_file(owner, repo, branch, path, use_cache, cache_minutes, cache_dir, max_bytes)
+
+    texts = {}
+    for path, text in zip(wanted, _FETCH_POOL.map(_fetch_one, wanted)):
+        # Skip files that failed to download (or are empty)
+        if text:
+            texts[path] = text
+
+    readme_text = texts.get(readme_path, "") if readme_path else ""
+    code_files = [{"path": p, "content": texts[p]} for p in chosen_paths if p in texts]
+    return readme_text, code_files
+
+
+def fetch_repo_sample(owner, repo, use_cache=True, cache_minutes=30, cache_dir="cache", max_bytes=SAMPLE_MAX_BYTES):
+    """
+    Fetch a small sample of a repository to send to the LLM.
+
+    Returns:
+      (readme_text, code_files)
+
+    where code_files is a list like:
+      [{"path": "README.md", "content": "..."},
+       {"path": "src/main.py", "content": "..."}, ...]
+
+    Strategy:
+    - With a GITHUB_TOKEN, try fetch_repo_sample_graphql first (branch + tree
+      in one request); the steps below are the REST fallback
+    - Fetch repo metadata to get the default branch, and (at the same time)
+      the README using the /readme endpoint (best-effort, only its clipped
+      text is cached)
+    - Fetch a recursive git tree of the default branch (one request)
+    - Choose a small set of "good" text/code files (avoid huge and binary)
+    - Download those files from the raw file host, in parallel
+      (contents API as a fallback)
+    - Keep only the first max_bytes of the README and of each file
+      (None keeps everything)
+    """
+    owner = (owner or "").strip()
+    repo = (repo or "").strip()
+    if owner == "" or repo == "":
+        return "", []
+
+    # 0) With a token, GraphQL gets the branch and tree in one request
+    # (see fetch_repo_sample_graphql). If it can't, use the REST calls below.
+    if GITHUB_TOKEN:
+        sample = fetch_repo_sample_graphql(
+            owner,
+            repo,
+            use_cache=use_cache,
+            cache_minutes=cache_minutes,
+            cache_dir=cache_dir,
+            max_bytes=max_bytes
+        )
+        if sample is not None:
+            return sample
+
+    # 1) + 2) Repo metadata and README. They don't depend on each other, so the
+    # README request goes to the shared pool while this thread asks for the
+    # metadata; that saves one full round-trip.
+    readme_url = f"https://api.github.com/repos/{owner}/{repo}/readme"
+    readme_future = _FETCH_POOL.submit(
+        _get_b64_text,
+        readme_url,
+        use_cache=use_cache,
+        cache_minutes=cache_minutes,
+        cache_dir=cache_dir,
+        max_bytes=max_bytes
+    )
+
+    # Repo metadata (needed to find default_branch reliably)
+    repo_url = f"https://api.github.com/repos/{owner}/{repo}"
+    repo_data, err = _get(
+        repo_url,
+        use_cache=use_cache,
+        cache_minutes=cache_minutes,
+        cache_dir=cache_dir
+    )
+
+    # If the repo doesn't exist / is private / API fails, return empty sample.
+    if err or not isinstance(repo_data, dict):
+        return "", []
+
+    default_branch = repo_data.get("default_branch", "main")
+
+    # README text (best effort; already decoded and cut to max_bytes)
+    readme_text, readme_err = readme_future.result()
+    if readme_err:
+        readme_text = ""
+
+    # 3) Fetch the recursive git tree (this gives a list of file paths).
+    # The trees endpoint accepts a branch name in place of a tree SHA, so this is
+    # ONE request instead of branch -> commit -> tree (two fewer round-trips).
+    tree_url = f"https://api.github.com/repos/{owner}/{repo}/git/trees/{default_branch}"
+    tree_data, err = _get(
+        tree_url,
+        params={"recursive": "1"},
+        use_cache=use_cache,
+        cache_minutes=cache_minutes,
+        cache_dir=cache_dir
+    )
+    if err or not isinstance(tree_data, dict):
+        # Fallback: resolve the tree SHA the long way and try again
+        # (e.g. branch names GitHub won't take in this URL).
+        tree_sha = _tree_sha_for_branch(owner, repo, default_branch, use_cache, cache_minutes, cache_dir)
+        if not tree_sha:
+            return readme_text, []
+
+        tree_url = f"https://api.github.com/repos/{owner}/{repo}/git/trees/{tree_sha}"
+        tree_data, err = _get(
+            tree_url,
+            params={"recursive": "1"},
             use_cache=use_cache,
             cache_minutes=cache_minutes,
             cache_dir=cache_dir
         )
-        if err or not isinstance(file_data, dict):
-            continue
+        if err or not isinstance(tree_data, dict):
+            return readme_text, []
 
-        # contents API returns base64 file content
-        content_b64 = file_data.get("content", "")
-        if not content_b64:
-            continue
+    entries = tree_data.get("tree", []) or []
+    if not entries:
+        return readme_text, []
 
-        try:
-            raw = base64.b64decode(content_b64).decode("utf-8", errors="replace")
-        except Exception:
+    # 4) Decide which files are worth sampling (text/code, see _GOOD_EXT)
+    chosen_paths = _choose_sample_paths(entries)
+
+    # 5) Download content for chosen files.
+    # Each file is its own request, so I send them in parallel on the shared
+    # pool (the waits overlap instead of adding up). map() keeps chosen_paths order.
+    def _fetch_one(path):
+        return _fetch_sample_file(owner, repo, default_branch, path, use_cache, cache_minutes, cache_dir, max_bytes)
+
+    code_files = []
+    for path, raw in zip(chosen_paths, _FETCH_POOL.map(_fetch_one, chosen_paths)):
+        # Skip files that failed to download (or are empty)
+        if not raw:
             continue
 
         code_files.append({"path": path, "content": raw})
 
-    return readme_text, code_files
\ No newline at end of file
+    return readme_text, code_files
@@ -15,16 +15,27 @@
 # Key design choices I made:
 # 1) I REQUIRE an API key from environment variables (never hard-code keys)
 # 2) I clean repo samples to reduce token usage and avoid minified files
-# 3) I force the model to return JSON only, then I parse and validate it
+# 3) I force the model to return JSON only (Groq JSON mode), then I parse and validate it
 # 4) I retry a few times because LLM APIs can fail or return messy outputs
 # 5) I clamp scores to 0–100 so the UI and database don't break
+# 6) I cache successful answers by (model, exact prompt), so an identical
+#    request never pays for a second Groq call
 
 import os
 import json
 import time
-import re
+from functools import lru_cache  # Build the Groq client once
+from itertools import islice  # First 3 bullets without converting the rest
 from groq import Groq
 
+from cache_utils import cache_get, cache_set, make_llm_prompt_key
+
+# Optional: orjson parses the model's JSON faster than the json module.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # I store secrets like API keys as environment variables, not in code.
 # In Codespaces, I add these in the Secrets panel.
@@ -33,6 +44,11 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 # Allow model to be overridden for testing, but default to a fast/cheap one.
 GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
 
+# Where successful LLM answers are cached, and for how long by default.
+# Same folder as the app's LLM cache, so its "Clear LLM cache" button clears these too.
+LLM_CACHE_DIR = "cache/llm"
+LLM_CACHE_MINUTES = 24 * 60
+
 
 def _require_key():
     """
@@ -45,18 +61,31 @@ def _require_key():
     return None
 
 
+@lru_cache(maxsize=1)
+def _get_client():
+    """
+    Return the shared Groq client, creating it on first use.
+
+    The client holds an HTTP connection pool, so building a new one per call
+    meant a new TLS connection for every LLM request. One client is reused by
+    every call (and thread) instead. Callers check _require_key() first,
+    because Groq() refuses to start without a key.
+    """
+    return Groq(api_key=GROQ_API_KEY)
+
+
 def _looks_minified(text):
     """
     Heuristic to skip minified/bundled JS:
     If any line is extremely long (ex: 500+ chars), it's likely minified.
     Minified files waste tokens and don't provide useful quality signals.
+
+    Text of 500 chars or less can't have such a line, so it skips the split.
+    max(map(len, ...)) keeps the per-line loop in C.
     """
-    if not text:
+    if not text or len(text) <= 500:
         return False
-    lines = text.splitlines()
-    if not lines:
-        return False
-    return max(len(line) for line in lines) > 500
+    return max(map(len, text.splitlines())) > 500
 
 
 def _clean_repo_sample(readme_text, code_files):
@@ -98,35 +127,28 @@ def _extract_json(text):
     """
     Parse JSON from the model output.
 
-    Why this exists:
-    LLMs sometimes add markdown fences like ```json ... ```
-    or extra commentary, even when instructed not to.
-    I do a best-effort extraction:
-      1) remove markdown fences
-      2) try json.loads directly
-      3) if that fails, regex-search for the first {...} block and parse that
+    The requests use Groq's JSON mode (response_format={"type": "json_object"}),
+    so the output is already a JSON object. I only strip whitespace and a
+    leading byte-order mark before parsing; the old markdown-fence removal and
+    regex search for a {...} block aren't needed anymore.
+    A ValueError here still goes through the caller's retry loop.
     """
     if not text:
         raise ValueError("Empty response")
 
-    cleaned = text.strip()
-
-    # Remove common markdown wrappers.
-    cleaned = cleaned.replace("```json", "").replace("```", "").strip()
-
-    # First attempt: parse directly.
-    try:
-        return json.loads(cleaned)
-    except Exception:
-        pass
-
-    # Second attempt: find a JSON object inside the text.
-    m = re.search(r"\{.*\}", cleaned, flags=re.DOTALL)
-    if not m:
-        raise ValueError("No JSON object found in model output.")
-
-    candidate = m.group(0)
-    return json.loads(candidate)
+    text = text.strip().lstrip("\ufeff")
+    data = None
+    if orjson is not None:
+        try:
+            data = orjson.loads(text)
+        except ValueError:
+            # orjson is stricter (e.g. no NaN); let json decide below.
+            data = None
+    if data is None:
+        data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("Model output is not a JSON object.")
+    return data
 
 
 def _clamp_score(x):
@@ -135,17 +157,52 @@ def _clamp_score(x):
     If parsing fails, return None (caller decides how to handle).
     """
     try:
-        n = int(x)
+        return min(100, max(0, int(x)))
     except Exception:
         return None
-    if n < 0:
-        n = 0
-    if n > 100:
-        n = 100
-    return n
 
 
-def analyze_repo_quality_with_llm(repo_full_name, readme_text, code_files):
+def _three_bullets(items, default):
+    """
+    Force a model-provided bullet list into exactly 3 strings (predictable UI
+    and PDF export): anything that isn't a list counts as empty, extra items
+    are dropped, and missing ones are filled with default.
+    Only the 3 kept items get converted to str, not the whole list.
+    """
+    if not isinstance(items, list):
+        return [default] * 3
+    out = [str(x) for x in islice(items, 3)]
+    return out + [default] * (3 - len(out))
+
+
+# Filler bullets for when the model gives fewer than 3.
+_DEFAULT_STRENGTH = "Not enough evidence in sample to make a confident strength."
+_DEFAULT_WEAKNESS = "Not enough evidence in sample to make a confident weakness."
+_DEFAULT_IMPROVEMENT = "Add a README with setup, usage, and project goals."
+
+
+def _validate_and_fill(data, raw):
+    """
+    Turn the parsed model JSON of analyze_repo_quality_with_llm into the
+    result dict the app relies on: strings cut to length, exactly 3 bullets
+    per list, and a clamped score.
+
+    One pass over the fields with a single bound data.get, so the retry loop
+    only has to do the API call and the parse.
+    """
+    get = data.get
+    return {
+        "repo_summary": str(get("repo_summary", ""))[:220],
+        "strengths": _three_bullets(get("strengths"), _DEFAULT_STRENGTH),
+        "weaknesses": _three_bullets(get("weaknesses"), _DEFAULT_WEAKNESS),
+        "suggested_improvements": _three_bullets(get("suggested_improvements"), _DEFAULT_IMPROVEMENT),
+        "skill_score": _clamp_score(get("skill_score")),
+        "notes": str(get("notes", ""))[:220],
+        "raw_output": raw,
+    }
+
+
+def analyze_repo_quality_with_llm(repo_full_name, readme_text, code_files, use_cache=True, cache_minutes=LLM_CACHE_MINUTES):
     """
     Evaluate a SINGLE repo using the LLM.
 
@@ -164,6 +221,10 @@ def analyze_repo_quality_with_llm(repo_full_name, readme_text, code_files):
     - Missing key returns (None, message)
     - LLM failures retry up to 3 times with exponential backoff
     - If still failing, return (None, detailed message)
+
+    Caching:
+    - With use_cache, a successful result is stored under (model, prompt) and
+      returned for the same prompt for cache_minutes. Errors are never cached.
     """
     err = _require_key()
     if err:
@@ -195,8 +256,15 @@ FILES (sample):
 {files}
 """.strip()
 
-    # Create the Groq client once for this call.
-    client = Groq(api_key=GROQ_API_KEY)
+    # Same model + same prompt = same question: reuse the earlier answer.
+    cache_key = make_llm_prompt_key(prompt, GROQ_MODEL) if use_cache else None
+    if cache_key:
+        hit = cache_get(LLM_CACHE_DIR, cache_key, cache_minutes)
+        if hit is not None:
+            return hit, None
+
+    # Shared client (reuses its open connections across calls).
+    client = _get_client()
 
     last_error = None
     last_raw = ""
@@ -213,6 +281,8 @@ FILES (sample):
                 ],
                 temperature=0.2,  # low randomness so output is consistent
                 max_tokens=900,   # enough room for the JSON payload
+                # JSON mode: Groq guarantees the reply is one valid JSON object.
+                response_format={"type": "json_object"},
             )
 
             raw = (resp.choices[0].message.content or "").strip()
@@ -221,43 +291,11 @@ FILES (sample):
             # Parse JSON and validate shapes.
             data = _extract_json(raw)
 
-            repo_summary = str(data.get("repo_summary", ""))[:220]
-            strengths = data.get("strengths", []) or []
-            weaknesses = data.get("weaknesses", []) or []
-            improvements = data.get("suggested_improvements", []) or []
-            notes = str(data.get("notes", ""))[:220]
-            score = _clamp_score(data.get("skill_score"))
-
-            # Make sure they are lists; otherwise treat as empty.
-            if not isinstance(strengths, list):
-                strengths = []
-            if not isinstance(weaknesses, list):
-                weaknesses = []
-            if not isinstance(improvements, list):
-                improvements = []
-
-            # Force exactly 3 items each (predictable UI and PDF export).
-            strengths = [str(x) for x in strengths][:3]
-            weaknesses = [str(x) for x in weaknesses][:3]
-            improvements = [str(x) for x in improvements][:3]
-
-            # If the model didn't provide enough bullets, I fill with safe defaults.
-            while len(strengths) < 3:
-                strengths.append("Not enough evidence in sample to make a confident strength.")
-            while len(weaknesses) < 3:
-                weaknesses.append("Not enough evidence in sample to make a confident weakness.")
-            while len(improvements) < 3:
-                improvements.append("Add a README with setup, usage, and project goals.")
-
-            return {
-                "repo_summary": repo_summary,
-                "strengths": strengths,
-                "weaknesses": weaknesses,
-                "suggested_improvements": improvements,
-                "skill_score": score,
-                "notes": notes,
-                "raw_output": raw,
-            }, None
+            # Validate shapes, fill missing bullets, clamp the score.
+            result = _validate_and_fill(data, raw)
+            if cache_key:
+                cache_set(LLM_CACHE_DIR, cache_key, result)
+            return result, None
 
         except Exception as e:
             # Save error so I can return useful information after all retries.
@@ -270,7 +308,7 @@ FILES (sample):
     return None, f"Groq JSON parse failed after retries. Last error: {last_error}. Preview: {preview}"
 
 
-def analyze_portfolio_summary(username, scored_repos):
+def analyze_portfolio_summary(username, scored_repos, use_cache=True, cache_minutes=LLM_CACHE_MINUTES):
     """
     Evaluate the ENTIRE portfolio (multiple repos) and generate a short summary.
 
@@ -287,6 +325,8 @@ def analyze_portfolio_summary(username, scored_repos):
       - top_strengths: 3 bullets
       - top_risks: 3 bullets
       - raw_output: raw model output for debugging
+
+    Cached by (model, prompt) like analyze_repo_quality_with_llm.
     """
     err = _require_key()
     if err:
@@ -318,7 +358,13 @@ Scored repo signals:
 {compact}
 """.strip()
 
-    client = Groq(api_key=GROQ_API_KEY)
+    cache_key = make_llm_prompt_key(prompt, GROQ_MODEL) if use_cache else None
+    if cache_key:
+        hit = cache_get(LLM_CACHE_DIR, cache_key, cache_minutes)
+        if hit is not None:
+            return hit, None
+
+    client = _get_client()
 
     last_error = None
     last_raw = ""
@@ -333,6 +379,7 @@ Scored repo signals:
                 ],
                 temperature=0.2,
                 max_tokens=600,
+                response_format={"type": "json_object"},
             )
 
             raw = (resp.choices[0].message.content or "").strip()
@@ -342,31 +389,24 @@ Scored repo signals:
 
             summary = str(data.get("recruiter_summary", ""))[:600]
             headline = str(data.get("headline", ""))[:90]
-            top_strengths = data.get("top_strengths", []) or []
-            top_risks = data.get("top_risks", []) or []
-
-            # Validate shapes and sanitize.
-            if not isinstance(top_strengths, list):
-                top_strengths = []
-            if not isinstance(top_risks, list):
-                top_risks = []
-
-            top_strengths = [str(x) for x in top_strengths][:3]
-            top_risks = [str(x) for x in top_risks][:3]
-
-            # Fill defaults so UI always has 3 bullets.
-            while len(top_strengths) < 3:
-                top_strengths.append("Not enough evidence to identify a clear strength.")
-            while len(top_risks) < 3:
-                top_risks.append("Not enough evidence to identify a clear risk.")
+            # Validate shapes and sanitize; fill defaults so UI always has 3 bullets.
+            top_strengths = _three_bullets(
+                data.get("top_strengths"), "Not enough evidence to identify a clear strength."
+            )
+            top_risks = _three_bullets(
+                data.get("top_risks"), "Not enough evidence to identify a clear risk."
+            )
 
-            return {
+            result = {
                 "headline": headline,
                 "recruiter_summary": summary,
                 "top_strengths": top_strengths,
                 "top_risks": top_risks,
                 "raw_output": raw,
-            }, None
+            }
+            if cache_key:
+                cache_set(LLM_CACHE_DIR, cache_key, result)
+            return result, None
 
         except Exception as e:
             last_error = repr(e)
@@ -19,6 +19,11 @@
 # - I keep printing logic separate from analysis logic.
 # - I use input validation (empty usernames, empty results) to avoid crashes.
 
+import threading  # Lock for the repo memo (analyze_file fetches in threads)
+from concurrent.futures import ThreadPoolExecutor  # Fetch several users at once
+from functools import lru_cache  # Run the old-mode init_db() only once
+import numpy as np
+
 from github_api import fetch_repos
 from analytics import (
     compute_summary,
@@ -27,21 +32,23 @@ from analytics import (
     top_repos_by_recent_push,
     top_languages,
     search_repos,
-    repo_score,
+    repo_scores,
     random_spotlight,
     numpy_speed_test,
     build_repo_rows,
+    enrich_repos,
 )
 from file_utils import (
     save_report,
     save_summary_json,
     save_repos_csv,
-    load_usernames,
+    iter_usernames,
+    export_timestamp,
 )
 
 # IMPORTANT:
 # In my current Streamlit version, db_utils functions are:
-#   init_db, create_run, save_repo_score, get_recent_runs, get_run_repo_scores
+#   init_db, create_run, save_repo_score(s), save_repo_metadata, get_recent_runs, get_run_repo_scores
 #
 # This CLI file uses save_run and upsert_repos, which are from an older DB approach.
 # If your db_utils.py still has save_run/upsert_repos, this will work.
@@ -57,10 +64,70 @@ try:
     _DB_MODE = "old"  # save_run + upsert_repos exist
 except Exception:
     # New DB mode (matches the Streamlit app's DB functions)
-    from db_utils import create_run, save_repo_score
+    from db_utils import create_run, save_repo_metadata, get_conn
     _DB_MODE = "new"
 
 
+@lru_cache(maxsize=1)
+def _init_db_once():
+    """
+    Old DB mode: run init_db() once per CLI session, not before every save.
+    (The new db_utils already sets its tables up once, on first use.)
+    """
+    init_db()
+    return True
+
+
+# ----------------------------
+# Repo list memo (this session only)
+# ----------------------------
+# Every menu option asks for a username and needs that user's repos. Running
+# option 3 and then option 4 for the same user used to fetch the same list
+# twice, so I keep the last few lists in memory until the program exits
+# (or the user picks "c" in the menu).
+# A plain dict and not lru_cache: failed fetches (typo, rate limit) return []
+# and must NOT be remembered, and lru_cache can't skip a single result.
+_REPO_MEMO = {}
+_REPO_MEMO_MAX = 32
+_REPO_MEMO_LOCK = threading.Lock()  # held only for dict reads/writes, never during a fetch
+
+# How many usernames analyze_file fetches at the same time. Each fetch is
+# mostly waiting on GitHub, so a few threads overlap those waits; I keep it
+# small because GitHub's secondary rate limits punish bursts of requests.
+FILE_FETCH_WORKERS = 8
+
+
+def get_repos(username):
+    """
+    fetch_repos(username), remembered for the rest of the session.
+
+    The stored copy is a tuple and every caller gets a fresh list of fresh
+    (shallow) dict copies, so one menu option can't change the repos another
+    one sees, whether it edits the list or the dicts in it.
+    """
+    key = (username or "").strip().lower()  # GitHub usernames ignore case
+    with _REPO_MEMO_LOCK:
+        hit = _REPO_MEMO.get(key)
+    if hit is not None:
+        return [dict(r) for r in hit]
+
+    repos = fetch_repos(username)
+    if repos:
+        with _REPO_MEMO_LOCK:
+            # Full: forget the oldest entry (dicts keep insertion order).
+            if len(_REPO_MEMO) >= _REPO_MEMO_MAX:
+                _REPO_MEMO.pop(next(iter(_REPO_MEMO)))
+            _REPO_MEMO[key] = tuple(dict(r) for r in repos)
+    return repos
+
+
+def clear_repo_memo():
+    """Forget every remembered repo list (the next option fetches fresh data)."""
+    with _REPO_MEMO_LOCK:
+        _REPO_MEMO.clear()
+    print("Cleared cached repo lists.")
+
+
 def print_menu():
     """
     Print the menu options.
@@ -74,6 +141,7 @@ def print_menu():
     print("3. Search repositories by keyword")
     print("4. Random spotlight + score")
     print("5. NumPy speed test")
+    print("c. Clear cached repo lists")
     print("q. Quit")
 
 
@@ -140,38 +208,30 @@ def _save_to_db(username, repos, repo_rows):
 
     Supports:
       - Old mode: save_run(username, repo_count) + upsert_repos(repo_rows)
-      - New mode: create_run(username, repo_count) + save_repo_score(run_id, row)
+      - New mode: create_run(username, repo_count) + save_repo_metadata(run_id, repo_rows)
     """
-    init_db()
-
     if _DB_MODE == "old":
         # Old schema approach: store repos as rows in a repos table (upsert).
+        _init_db_once()
         save_run(username, repo_count=len(repos))
         upsert_repos(repo_rows)
         return None
 
     # New schema approach: store a run row + a repo_scores row per repo.
-    run_id = create_run(username, repo_count=len(repos))
-
-    # In the Streamlit version, save_repo_score expects scoring fields too.
-    # Here, the CLI is mostly analytics-focused, so I store the repo metadata and keep scores blank.
-    for rr in repo_rows:
-        save_repo_score(
+    # (The new db_utils sets up its tables once on first use, so no init_db() here.)
+    # Both writes share ONE pooled connection (db_utils keeps the pool open for
+    # the whole CLI session, already set to WAL + synchronous=NORMAL).
+    with get_conn() as conn:
+        run_id = create_run(username, repo_count=len(repos), conn=conn)
+
+        # The CLI is mostly analytics-focused, so I store the repo metadata and keep scores blank.
+        # save_repo_metadata reads just name / url / language from each row and
+        # inserts them all with one executemany() and one commit.
+        save_repo_metadata(
             run_id,
-            {
-                "repo": rr.get("name", ""),
-                "url": rr.get("html_url", ""),
-                "language": rr.get("language", ""),
-                "total_score": None,
-                "llm_skill_score": None,
-                "hard_score": None,
-                "activity_score": None,
-                "popularity_score": None,
-                "health_score": None,
-                "strengths": [],
-                "weaknesses": [],
-                "notes": "Saved from CLI mode (no LLM scoring performed).",
-            },
+            repo_rows,
+            notes="Saved from CLI mode (no LLM scoring performed).",
+            conn=conn,
         )
 
     return run_id
@@ -196,25 +256,31 @@ def analyze_one():
         return
 
     # Fetch repos from GitHub.
-    repos = fetch_repos(username)
+    repos = get_repos(username)
     if not repos:
         print("No repos returned (invalid username, private, or rate-limited).")
         return
 
+    # Enrich once (dates -> days_since_push, activity flags) and reuse it below,
+    # so each analytics step doesn't re-parse every date on its own.
+    enriched = enrich_repos(repos)
+
     # Analytics computations (pure functions, no side effects).
-    summary = compute_summary(repos)
+    summary = compute_summary(enriched)
     top_stars = top_repos_by_stars(repos, n=10)
     top_forks = top_repos_by_forks(repos, n=10)
-    top_recent = top_repos_by_recent_push(repos, n=10)
+    top_recent = top_repos_by_recent_push(enriched, n=10)
     langs = top_languages(repos, n=10)
 
     # Convert repos to normalized rows for export/DB.
-    repo_rows = build_repo_rows(repos, username=username)
+    repo_rows = build_repo_rows(repos, username=username, enriched=enriched)
 
     # Save exports (TXT/JSON/CSV).
-    txt_path = save_report(username, summary, top_stars, langs)
-    json_path = save_summary_json(username, summary)
-    csv_path = save_repos_csv(username, repo_rows)
+    # One timestamp for the whole run, so the three files match up by name.
+    ts = export_timestamp()
+    txt_path = save_report(username, summary, top_stars, langs, ts=ts)
+    json_path = save_summary_json(username, summary, ts=ts)
+    csv_path = save_repos_csv(username, repo_rows, ts=ts)
 
     # Save to DB (supports old OR new schema).
     run_id = _save_to_db(username, repos, repo_rows)
@@ -251,19 +317,34 @@ def analyze_file():
     - no DB writes
     - just prints summary for each username
     """
-    usernames = load_usernames()
-    if not usernames:
+    # Fetching is the slow part (one GitHub round-trip per user, or more), so
+    # every user's repos are fetched in parallel threads. map() hands results
+    # back in file order, so the output reads exactly like the one-by-one version.
+    def _fetch(u):
+        return u, get_repos(u)
+
+    # Each user once (case-insensitive, first spelling wins, file order kept):
+    # two threads asking for the same user would both miss the memo and fetch it twice.
+    usernames = {}
+    for u in iter_usernames():
+        usernames.setdefault(u.lower(), u)
+
+    found_any = False
+
+    with ThreadPoolExecutor(max_workers=FILE_FETCH_WORKERS) as ex:
+        results = ex.map(_fetch, usernames.values())
+
+        for u, repos in results:
+            found_any = True
+            print(f"\nAnalyzing {u}...")
+            if not repos:
+                print("  (No repos returned)")
+                continue
+            summary = compute_summary(repos)
+            print_summary(summary)
+
+    if not found_any:
         print("No usernames found. Create usernames.txt with one username per line.")
-        return
-
-    for u in usernames:
-        print(f"\nAnalyzing {u}...")
-        repos = fetch_repos(u)
-        if not repos:
-            print("  (No repos returned)")
-            continue
-        summary = compute_summary(repos)
-        print_summary(summary)
 
 
 def search_option():
@@ -282,7 +363,7 @@ def search_option():
         print("Username and keyword are required.")
         return
 
-    repos = fetch_repos(username)
+    repos = get_repos(username)
     if not repos:
         print("No repos returned.")
         return
@@ -304,14 +385,14 @@ def spotlight_option():
 
     Demonstrates:
     - sampling (random_spotlight)
-    - a custom scoring function using math.log and sqrt (repo_score)
+    - a custom scoring function using log and sqrt (repo_score, batched as repo_scores)
     """
     username = input("Enter GitHub username: ").strip()
     if username == "":
         print("Username is required.")
         return
 
-    repos = fetch_repos(username)
+    repos = get_repos(username)
     if not repos:
         print("No repos returned.")
         return
@@ -320,8 +401,10 @@ def spotlight_option():
 
     print("\nRANDOM SPOTLIGHT (custom score)")
     print("----------------------------")
-    for r in picks:
-        print(r.get("name"), "| score=", round(repo_score(r), 3), "|", r.get("html_url"))
+    # Score all picks in one NumPy call (repo_scores is the batch repo_score).
+    scores = repo_scores(picks).tolist()
+    for r, score in zip(picks, scores):
+        print(r.get("name"), "| score=", round(score, 3), "|", r.get("html_url"))
 
 
 def numpy_option():
@@ -337,12 +420,13 @@ def numpy_option():
         print("Username is required.")
         return
 
-    repos = fetch_repos(username)
+    repos = get_repos(username)
     if not repos:
         print("No repos returned.")
         return
 
-    stars = [int(r.get("stargazers_count", 0)) for r in repos]
+    # One int64 array filled straight from the repos (no temporary list of ints).
+    stars = np.fromiter((r.get("stargazers_count") or 0 for r in repos), dtype=np.int64, count=len(repos))
     results = numpy_speed_test(stars)
 
     print("\nNUMPY SPEED TEST")
@@ -352,6 +436,23 @@ def numpy_option():
     print(f"Loop time : {results['loop_seconds']:.8f} seconds")
     print(f"NumPy time: {results['numpy_seconds']:.8f} seconds")
 
+    # The Numba result only exists if numba is installed.
+    if results.get("numba_seconds") is not None:
+        print(f"Numba mean: {round(results['numba_mean'], 4)}")
+        print(f"Numba time: {results['numba_seconds']:.8f} seconds")
+
+
+# Menu choice -> function that runs it. Adding a menu option means one line
+# here (plus its line in print_menu), not another elif branch in main().
+MENU_HANDLERS = {
+    "1": analyze_one,
+    "2": analyze_file,
+    "3": search_option,
+    "4": spotlight_option,
+    "5": numpy_option,
+    "c": clear_repo_memo,
+}
+
 
 def main():
     """
@@ -366,16 +467,10 @@ def main():
         print_menu()
         choice = input("Choice: ").strip().lower()
 
-        if choice == "1":
-            analyze_one()
-        elif choice == "2":
-            analyze_file()
-        elif choice == "3":
-            search_option()
-        elif choice == "4":
-            spotlight_option()
-        elif choice == "5":
-            numpy_option()
+        # Look the choice up in the menu table instead of an if/elif chain.
+        handler = MENU_HANDLERS.get(choice)
+        if handler is not None:
+            handler()
         elif choice == "q":
             print("Goodbye!")
         else:
@@ -13,15 +13,23 @@
 # How it works (high level):
 # - Create the reports/ folder if it doesn't exist
 # - Build a filename (with timestamp so it doesn't overwrite old files)
-# - Use a ReportLab canvas and manually draw lines of text from top to bottom
-# - If the page fills up, start a new page
-# - Save the PDF and return the file path
-
+# - Build the report as a list of "flowables" (ReportLab Platypus): headings,
+#   paragraphs and small tables
+# - ReportLab lays them out in one pass, wrapping long text and starting new
+#   pages by itself
+# - Save the PDF and return the file path (or the raw PDF bytes, for downloads)
+
+import heapq
+import io
 import os
 from datetime import datetime
 
+from xml.sax.saxutils import escape  # Paragraph text is mini-HTML, so & and < need escaping
+
+from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
 
 
 # All PDFs will be saved here so the project stays organized.
@@ -38,7 +46,7 @@ def ensure_reports_dir():
     os.makedirs(REPORTS_DIR, exist_ok=True)
 
 
-def export_recruiter_pdf(username, summary, avg_scores, repo_rows, output_name=None):
+def export_recruiter_pdf(username, summary, avg_scores, repo_rows, output_name=None, as_bytes=False):
     """
     Create a PDF report file and return the saved file path.
 
@@ -54,111 +62,135 @@ def export_recruiter_pdf(username, summary, avg_scores, repo_rows, output_name=N
         repo, url, total_score, etc.
       output_name (str | None):
         Optional filename override. If None, we generate a timestamped filename.
+      as_bytes (bool):
+        If True, build the PDF in memory and return its bytes instead of writing
+        a file. The Streamlit download button only needs the bytes, so this skips
+        writing the file and then reading it straight back.
 
     Returns:
       path (str):
         Path to the saved PDF file, inside the reports/ folder.
+        (bytes instead, when as_bytes=True)
 
     Notes:
-      - This is a simple “manual layout” PDF, which is fine for a first version.
-      - ReportLab does not auto-wrap text by default, so I clamp long strings.
-      - I also include a simple page-break check so text doesn’t run off the page.
+      - The layout is done by ReportLab Platypus (SimpleDocTemplate): I only list
+        the headings, paragraphs and tables in order, and it handles fonts, text
+        wrapping and page breaks. (The first version drew every line by hand with
+        drawString, cut long strings at 120 characters, and checked for the
+        bottom of the page itself.)
     """
-    ensure_reports_dir()
-
     # Timestamp is used so each export has a unique filename and old reports aren't overwritten.
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-    if not output_name:
-        output_name = f"{username}_recruiter_report_{timestamp}.pdf"
-
-    path = os.path.join(REPORTS_DIR, output_name)
-
-    # Create a new PDF canvas at letter size.
-    c = canvas.Canvas(path, pagesize=letter)
-    width, height = letter  # width/height in points
-
-    # Basic layout settings (top-left-ish origin, but ReportLab uses bottom-left coordinate system)
-    x = 50                 # left margin
-    y = height - 50        # start near top of the page
-    line = 14              # line spacing (points)
-
-    def write(text, bold=False):
-        """
-        Write a single line of text to the PDF and move the cursor downward.
-
-        Why I wrote a helper:
-        - Reduces repeated font + drawString code
-        - Centralizes the page-break logic
-        - Keeps the main report logic clean and readable
-        """
-        nonlocal y
-
-        # If we're too close to the bottom, start a new page.
-        if y < 60:
-            c.showPage()
-            y = height - 50
-
-        # Switch font based on "bold" flag.
-        c.setFont("Helvetica-Bold" if bold else "Helvetica", 11)
-
-        # ReportLab drawString doesn't wrap automatically, so I clamp long strings.
-        c.drawString(x, y, str(text)[:120])
-        y -= line
+    if as_bytes:
+        # ReportLab can write into any file-like object, so I give it a memory buffer.
+        target = io.BytesIO()
+    else:
+        ensure_reports_dir()
+
+        if not output_name:
+            output_name = f"{username}_recruiter_report_{timestamp}.pdf"
+
+        target = os.path.join(REPORTS_DIR, output_name)
+
+    # Letter size with the same 50 pt margins the hand-drawn version used.
+    doc = SimpleDocTemplate(
+        target,
+        pagesize=letter,
+        leftMargin=50,
+        rightMargin=50,
+        topMargin=50,
+        bottomMargin=50,
+        title="GitHub Activity Analyzer — Recruiter Report",
+    )
+
+    styles = getSampleStyleSheet()
+    body = styles["BodyText"]
+    small = styles["BodyText"].clone("Small", fontSize=8, leading=10)
+
+    def para(text, style=body):
+        """A wrapped paragraph of plain text (escaped, so names like a<b>&c print as-is)."""
+        return Paragraph(escape(str(text)), style)
+
+    def key_value_table(pairs):
+        """Two-column label/value table for the snapshot and score sections."""
+        table = Table([[label, str(value)] for label, value in pairs], colWidths=[200, 150], hAlign="LEFT")
+        table.setStyle(TableStyle([
+            ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
+            ("FONTSIZE", (0, 0), (-1, -1), 10),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
+            ("TOPPADDING", (0, 0), (-1, -1), 3),
+        ]))
+        return table
 
     # ----------------------------
     # Report Content
     # ----------------------------
+    story = []
 
     # Title section
-    write("GitHub Activity Analyzer — Recruiter Report", bold=True)
-    write(f"Username: {username}")
-    write(f"Generated: {timestamp}")
-    write("")
+    story.append(Paragraph("GitHub Activity Analyzer — Recruiter Report", styles["Title"]))
+    story.append(para(f"Username: {username}"))
+    story.append(para(f"Generated: {timestamp}"))
+    story.append(Spacer(1, 12))
 
     # Snapshot section
     # This is meant to quickly summarize the portfolio without needing deep details.
-    write("Quick Snapshot", bold=True)
-    write(f"Repo Count: {summary.get('repo_count', 0)}")
-    write(f"Total Stars: {summary.get('total_stars', 0)}")
-    write(f"Avg Stars: {round(summary.get('avg_stars', 0), 2)}")
-    write(f"Active Repos (90d): {summary.get('active_90d', 0)}")
-    write("")
+    story.append(Paragraph("Quick Snapshot", styles["Heading2"]))
+    story.append(key_value_table([
+        ("Repo Count", summary.get("repo_count", 0)),
+        ("Total Stars", summary.get("total_stars", 0)),
+        ("Avg Stars", round(summary.get("avg_stars", 0), 2)),
+        ("Active Repos (90d)", summary.get("active_90d", 0)),
+    ]))
 
     # Score averages section
     # This summarizes the "scored repos" snapshot from the LLM scoring results.
-    write("Combined Scores (Averages across scored repos)", bold=True)
+    story.append(Paragraph("Combined Scores (Averages across scored repos)", styles["Heading2"]))
     if avg_scores:
-        write(f"Avg Total Score: {avg_scores.get('total_score')}")
-        write(f"Avg LLM Skill Score: {avg_scores.get('llm_skill_score')}")
-        write(f"Avg Hard Score: {avg_scores.get('hard_score')}")
-        write(f"Avg Activity Score: {avg_scores.get('activity_score')}")
-        write(f"Avg Popularity Score: {avg_scores.get('popularity_score')}")
-        write(f"Avg Health Score: {avg_scores.get('health_score')}")
+        story.append(key_value_table([
+            ("Avg Total Score", avg_scores.get("total_score")),
+            ("Avg LLM Skill Score", avg_scores.get("llm_skill_score")),
+            ("Avg Hard Score", avg_scores.get("hard_score")),
+            ("Avg Activity Score", avg_scores.get("activity_score")),
+            ("Avg Popularity Score", avg_scores.get("popularity_score")),
+            ("Avg Health Score", avg_scores.get("health_score")),
+        ]))
     else:
-        write("No scored repos available yet.")
-    write("")
+        story.append(para("No scored repos available yet."))
 
-    # Top repos section (table-ish format)
-    write("Top Repos (by Total Score)", bold=True)
+    # Top repos section: one table, header row + one row per repo.
+    story.append(Paragraph("Top Repos (by Total Score)", styles["Heading2"]))
 
     if repo_rows:
-        # Sort by total_score descending and keep the top 10.
-        top = sorted(repo_rows, key=lambda r: (r.get("total_score") or 0), reverse=True)[:10]
+        # Top 10 by total_score, highest first. nlargest keeps a 10-item heap
+        # instead of sorting every row (same result as sorted(...)[:10], ties included).
+        top = heapq.nlargest(10, repo_rows, key=lambda r: (r.get("total_score") or 0))
 
+        data = [["Repo", "Total", "URL"]]
         for r in top:
-            name = r.get("repo", "")
-            total = r.get("total_score", "")
-            url = r.get("url", "")
-
-            # I write repo name + score, then URL on the next line.
-            write(f"{name} | total={total}")
-            write(f"{url}")
-            write("")  # blank line for spacing
+            # Paragraph cells wrap long names / URLs inside their column.
+            data.append([
+                para(r.get("repo", "")),
+                str(r.get("total_score", "")),
+                para(r.get("url", ""), small),
+            ])
+
+        table = Table(data, colWidths=[160, 50, 302], repeatRows=1, hAlign="LEFT")
+        table.setStyle(TableStyle([
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("FONTSIZE", (0, 0), (-1, -1), 10),
+            ("LINEBELOW", (0, 0), (-1, 0), 0.75, colors.black),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.whitesmoke]),
+        ]))
+        story.append(table)
     else:
-        write("No repo rows available.")
-        write("")
+        story.append(para("No repo rows available."))
+
+    # Lay out every page and save the PDF.
+    doc.build(story)
 
-    # Save and close the PDF file.
-    c.save()
-    return path
\ No newline at end of file
+    if as_bytes:
+        return target.getvalue()
+    return target
@@ -20,6 +20,19 @@
 # If I want to emphasize different signals, I only have to change them in one spot.
 
 import math
+from bisect import bisect_left  # Find which activity bracket a push age falls in
+import numpy as np
+
+
+# The numeric score fields, in the column order used by score_matrix().
+SCORE_KEYS = (
+    "activity_score",
+    "popularity_score",
+    "health_score",
+    "hard_score",
+    "llm_skill_score",
+    "total_score",
+)
 
 
 def clamp(x, lo=0, hi=100):
@@ -30,12 +43,22 @@ def clamp(x, lo=0, hi=100):
     UI score displays, charts, and comparisons are easiest when every score
     is guaranteed to land inside [0, 100]. This prevents outliers or math
     mistakes from producing nonsense values like -12 or 240.
+
+    min/max are C builtins, so one expression is cheaper than two Python-level ifs.
+    x goes first: on a tie min/max keep the first argument, so x == lo or x == hi
+    returns x itself (0.0 stays a float), exactly like the old if-version.
     """
-    if x < lo:
-        return lo
-    if x > hi:
-        return hi
-    return x
+    return min(max(x, lo), hi)
+
+
+# Activity brackets: pushed within _ACTIVITY_EDGES[i] days scores _ACTIVITY_SCORES[i];
+# older than the last edge scores the last entry.
+_ACTIVITY_EDGES = (7, 30, 90, 365)
+_ACTIVITY_SCORES = (100, 85, 70, 45, 20)
+
+# The same table as arrays, for activity_score_vec().
+_ACTIVITY_EDGES_NP = np.array(_ACTIVITY_EDGES, dtype=np.float64)
+_ACTIVITY_SCORES_NP = np.array(_ACTIVITY_SCORES, dtype=np.float64)
 
 
 def activity_score(days_since_push):
@@ -55,21 +78,25 @@ def activity_score(days_since_push):
     - pushed in the last week feels “active”
     - pushed in the last month feels “maintained”
     - pushed in the last year feels “stale-ish”
+
+    The thresholds live in one table (_ACTIVITY_EDGES / _ACTIVITY_SCORES):
+    bisect_left finds the first edge >= d, so "d <= edge" picks that edge's score.
     """
     if days_since_push is None:
         return 0
 
-    d = float(days_since_push)
+    return _ACTIVITY_SCORES[bisect_left(_ACTIVITY_EDGES, float(days_since_push))]
+
 
-    if d <= 7:
-        return 100
-    if d <= 30:
-        return 85
-    if d <= 90:
-        return 70
-    if d <= 365:
-        return 45
-    return 20
+def activity_score_vec(days):
+    """
+    activity_score() for a whole NumPy array of push ages at once.
+    NaN means "unknown push date" and scores 0, like None does above.
+    Returns a float64 array.
+    """
+    days = np.asarray(days, dtype=np.float64)
+    scores = _ACTIVITY_SCORES_NP[np.searchsorted(_ACTIVITY_EDGES_NP, days)]
+    return np.where(np.isnan(days), 0.0, scores)
 
 
 def popularity_score(stars, forks):
@@ -159,7 +186,17 @@ def combined_repo_score(repo_row, llm_skill_score=None):
     a = activity_score(repo_row.get("days_since_push"))
     p = popularity_score(repo_row.get("stargazers_count"), repo_row.get("forks_count"))
     h = repo_health_score(repo_row.get("open_issues_count"), repo_row.get("archived"))
+    return blend_scores(a, p, h, llm_skill_score)
 
+
+def blend_scores(a, p, h, llm_skill_score=None):
+    """
+    Turn the three metadata scores (activity, popularity, health) plus an optional
+    LLM score into the output dict of combined_repo_score().
+
+    Split out so the batch path can get a, p, h for every repo from score_many()
+    and still produce exactly the same dict as the single-repo path.
+    """
     # Hard score is a weighted blend of simple, explainable metadata signals.
     # I weighted Activity highest because recency often matters for assessing “current skill.”
     hard = (0.45 * a) + (0.35 * p) + (0.20 * h)
@@ -185,13 +222,88 @@ def combined_repo_score(repo_row, llm_skill_score=None):
     }
 
 
-def average_scores(score_rows):
+# Column order of the array returned by score_many().
+HARD_SCORE_KEYS = ("activity_score", "popularity_score", "health_score", "hard_score")
+
+
+def score_many(repo_rows):
+    """
+    The hard-metric scores of many repos at once, as one NumPy array.
+
+    Input:
+      repo_rows: list[dict] with the same keys combined_repo_score() reads
+        (days_since_push, stargazers_count, forks_count, open_issues_count, archived)
+
+    Output:
+      float64 array of shape (number of repos, 4), columns in HARD_SCORE_KEYS order:
+      activity, popularity, health, hard. Values are not rounded (round them
+      like combined_repo_score does if you show them).
+
+    Why:
+    combined_repo_score() is a handful of Python calls and branches per repo.
+    Here every rule is applied to whole columns instead (a sorted lookup for the
+    activity thresholds, np.log1p / np.clip for the rest), so N repos cost one
+    pass of array math instead of N function calls. Same math, same thresholds
+    and weights as the single-repo functions above.
+
+    No numba here: a user has at most a few hundred repos, and these are a few
+    whole-array NumPy ops already, so an @njit compile would cost more than it saves.
+    """
+    rows = repo_rows or []
+    n = len(rows)
+
+    # One column per input field. None push dates become NaN (scored 0 below),
+    # everything else is cleaned the same way the single-repo functions do it.
+    days = np.fromiter(
+        (np.nan if r.get("days_since_push") is None else float(r.get("days_since_push")) for r in rows),
+        dtype=np.float64,
+        count=n,
+    )
+    stars = np.fromiter((max(0, int(r.get("stargazers_count") or 0)) for r in rows), dtype=np.float64, count=n)
+    forks = np.fromiter((max(0, int(r.get("forks_count") or 0)) for r in rows), dtype=np.float64, count=n)
+    issues = np.fromiter((max(0, int(r.get("open_issues_count") or 0)) for r in rows), dtype=np.float64, count=n)
+    archived = np.fromiter((bool(r.get("archived")) for r in rows), dtype=np.float64, count=n)
+
+    # activity_score(), looked up in the same threshold table.
+    activity = activity_score_vec(days)
+
+    # popularity_score() and repo_health_score()
+    popularity = np.clip(np.log1p(stars) * 18 + np.log1p(forks) * 14, 0, 100)
+    health = np.clip(85 - 25 * archived - np.minimum(25, issues * 1.5), 0, 100)
+
+    # Same weights as combined_repo_score()
+    hard = (0.45 * activity) + (0.35 * popularity) + (0.20 * health)
+
+    return np.column_stack((activity, popularity, health, hard)).reshape(n, len(HARD_SCORE_KEYS))
+
+
+def score_matrix(score_rows):
+    """
+    Pack the numeric scores of many repos into one NumPy array.
+
+    Shape is (number of repos, len(SCORE_KEYS)), one column per score field.
+    Missing scores (like llm_skill_score when the LLM failed) become NaN.
+
+    Why float64 and not a tiny int type:
+    scores are 0–100 but rounded to 1 decimal, so an int8 would throw the decimal away
+    (and float32 can flip a .x5 average when rounding). float64 still stores each
+    score in 8 bytes, packed together, instead of a separate ~24-byte Python float.
+    """
+    return np.array(
+        [[np.nan if r.get(k) is None else float(r.get(k)) for k in SCORE_KEYS] for r in score_rows],
+        dtype=np.float64,
+    ).reshape(-1, len(SCORE_KEYS))
+
+
+def average_scores(score_rows, matrix=None):
     """
     Compute simple averages across repos.
 
     Input:
       score_rows: list[dict]
         Each dict should contain keys produced by combined_repo_score().
+      matrix: optional precomputed score_matrix(score_rows)
+        The Streamlit app builds it once per scoring run and reuses it on reruns.
 
     Output:
       dict of averages (rounded to 1 decimal), where missing values stay None.
@@ -199,41 +311,36 @@ def average_scores(score_rows):
     Implementation notes:
     - I track sums + counts separately because llm_skill_score may be None
       for some repos. That means I can't just average blindly.
+      With the matrix, None is NaN, so nansum + a count of non-NaN values
+      does the same thing for every column at once.
     - This design also prevents division-by-zero errors.
     """
-    if not score_rows:
+    if matrix is None:
+        matrix = score_matrix(score_rows or [])
+
+    if matrix.shape[0] == 0:
         return {}
 
-    keys = [
-        "activity_score",
-        "popularity_score",
-        "health_score",
-        "hard_score",
-        "llm_skill_score",
-        "total_score",
-    ]
-
-    sums = {k: 0.0 for k in keys}
-    counts = {k: 0 for k in keys}
-
-    for r in score_rows:
-        for k in keys:
-            v = r.get(k)
-            if v is None:
-                continue
-            sums[k] += float(v)
-            counts[k] += 1
+    present = ~np.isnan(matrix)
+    counts = present.sum(axis=0)
+    sums = np.nansum(matrix, axis=0)
 
     avg = {}
-    for k in keys:
-        if counts[k] == 0:
+    for k, total, n in zip(SCORE_KEYS, sums.tolist(), counts.tolist()):
+        if n == 0:
             avg[k] = None
         else:
-            avg[k] = round(sums[k] / counts[k], 1)
+            avg[k] = round(total / n, 1)
 
     return avg
 
 
+# confidence_score() base by number of scored repos:
+# <= 1 repo -> 20, <= 3 -> 50, <= 5 -> 70, more -> 90 (same lookup idea as the activity table).
+_CONFIDENCE_EDGES = (1, 3, 5)
+_CONFIDENCE_BASE = (20, 50, 70, 90)
+
+
 def confidence_score(scores):
     """
     Compute a simple confidence score (0–100) for the overall snapshot.
@@ -260,22 +367,12 @@ def confidence_score(scores):
     if not scores:
         return 0
 
-    valid = 0
-    for r in scores:
-        if r.get("llm_skill_score") is not None:
-            valid += 1
+    n = len(scores)
+    valid = sum(1 for r in scores if r.get("llm_skill_score") is not None)
+    pct = valid / n
 
-    pct = valid / len(scores)
-
-    # Base confidence grows as we score more repos.
-    if len(scores) <= 1:
-        base = 20
-    elif len(scores) <= 3:
-        base = 50
-    elif len(scores) <= 5:
-        base = 70
-    else:
-        base = 90
+    # Base confidence grows as we score more repos (see _CONFIDENCE_EDGES).
+    base = _CONFIDENCE_BASE[bisect_left(_CONFIDENCE_EDGES, n)]
 
     # Multiply by pct so missing LLM scores reduce confidence.
-    return int(base * pct)
\ No newline at end of file
+    return int(base * pct)
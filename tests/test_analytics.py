@@ -12,7 +12,7 @@ structure simple and explicit.
 """
 
 import unittest
-from analytics import compute_summary, top_languages
+from analytics import compute_summary, top_languages, enrich_repos
 
 
 class TestAnalytics(unittest.TestCase):
@@ -52,6 +52,43 @@ class TestAnalytics(unittest.TestCase):
         self.assertEqual(summary["active_30d"], 0)
 
 
+    def test_compute_summary_counts(self):
+        """
+        This test verifies the summary math on a small mixed list.
+
+        I include one repo with no pushed_at date on purpose, because
+        missing dates should count as "stale" and never as "active".
+        """
+
+        repos = [
+            {"stargazers_count": 5, "open_issues_count": 2, "pushed_at": "2000-01-01T00:00:00Z"},
+            {"stargazers_count": 1, "open_issues_count": 0, "pushed_at": None},
+            {"stargazers_count": 0, "open_issues_count": 3},
+        ]
+
+        summary = compute_summary(repos)
+
+        # Star stats
+        self.assertEqual(summary["total_stars"], 6)
+        self.assertEqual(summary["min_stars"], 0)
+        self.assertEqual(summary["max_stars"], 5)
+
+        # All three are old or missing a date, so none are active
+        self.assertEqual(summary["active_365d"], 0)
+        self.assertEqual(summary["stale_365d_plus"], 3)
+
+        # Issues overview
+        self.assertEqual(summary["total_open_issues"], 5)
+        self.assertEqual(summary["repos_with_issues"], 2)
+
+        # Same answer when only some repos are already enriched: the rest
+        # still have their dates parsed instead of counting as missing.
+        recent = {"stargazers_count": 0, "open_issues_count": 0, "pushed_at": "2999-01-01T00:00:00Z"}
+        mixed = compute_summary(enrich_repos(repos[:1]) + [recent])
+        self.assertEqual(mixed["active_30d"], 1)
+        self.assertEqual(mixed["stale_365d_plus"], 1)
+
+
     def test_top_languages_counts(self):
         """
         This test verifies that top_languages() correctly:
@@ -93,6 +130,36 @@ class TestAnalytics(unittest.TestCase):
         self.assertEqual(langs[1]["repo_count"], 1)
 
 
+    def test_enrich_repos_twice_still_copies(self):
+        """
+        Calling enrich_repos() on an already-enriched list skips the date
+        work, but without inplace=True it must still hand back new dicts,
+        so editing the result never changes the caller's list.
+
+        A list where only the first repo is enriched must still enrich the rest.
+        """
+
+        raw = [
+            {"name": "a", "pushed_at": "2000-01-01T00:00:00Z"},
+            {"name": "b", "pushed_at": None},
+        ]
+        once = enrich_repos(raw)
+        twice = enrich_repos(once)
+
+        # Same values, but different list and dict objects
+        self.assertEqual(twice, once)
+        self.assertIsNot(twice, once)
+        self.assertIsNot(twice[0], once[0])
+
+        # inplace=True is allowed to return the caller's list
+        self.assertIs(enrich_repos(once, inplace=True), once)
+
+        # Mixed list: the second repo still gets its derived fields
+        mixed = enrich_repos([once[0], {"name": "c", "pushed_at": None}])
+        self.assertIn("days_since_push", mixed[1])
+        self.assertIsNone(mixed[1]["days_since_push"])
+
+
 # This allows the test file to be run directly from the command line:
 # python test_analytics.py
 if __name__ == "__main__":
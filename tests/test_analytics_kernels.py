@@ -0,0 +1,56 @@
+"""
+test_analytics_kernels.py
+
+This file contains unit tests for the analytics_kernels module.
+
+The single-pass loop kernel (the one Numba compiles ahead of time) and the
+NumPy fallback must always agree, because the app uses whichever one is
+available. These tests check that they do.
+"""
+
+import unittest
+import numpy as np
+from analytics_kernels import SUMMARY_FIELDS, _summarize_loop, _summarize_numpy
+
+
+class TestAnalyticsKernels(unittest.TestCase):
+    """
+    Validates the summary kernels inside analytics_kernels.py.
+    """
+
+    def test_loop_matches_numpy(self):
+        """
+        The loop tracks min/max stars as running values instead of keeping a
+        list of every star count, so I compare it against NumPy's min()/max()
+        (and every other reduction) on mixed data, including a missing date.
+        """
+        stars = np.array([4, 0, 12, 7], dtype=np.int64)
+        days = np.array([3, 45, np.iinfo(np.int64).max, 400], dtype=np.int64)
+        issues = np.array([0, 2, 0, 5], dtype=np.int64)
+
+        loop = dict(zip(SUMMARY_FIELDS, _summarize_loop(stars, days, issues).tolist()))
+        vec = dict(zip(SUMMARY_FIELDS, _summarize_numpy(stars, days, issues).tolist()))
+
+        self.assertEqual(loop, vec)
+
+        # Spot-check the running min/max directly
+        self.assertEqual(loop["min_stars"], 0)
+        self.assertEqual(loop["max_stars"], 12)
+
+        # The missing date and the 400-day repo are both stale
+        self.assertEqual(loop["stale_365d_plus"], 2)
+
+    def test_empty_arrays(self):
+        """
+        With no repos, both versions should return all zeros (not crash on min/max).
+        """
+        empty = np.array([], dtype=np.int64)
+
+        self.assertEqual(_summarize_loop(empty, empty, empty).tolist(), [0] * len(SUMMARY_FIELDS))
+        self.assertEqual(_summarize_numpy(empty, empty, empty).tolist(), [0] * len(SUMMARY_FIELDS))
+
+
+# This allows the test file to be run directly from the command line:
+# python test_analytics_kernels.py
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+test_db_utils.py
+
+This file contains unit tests for the db_utils module.
+
+strengths/weaknesses are saved as JSON text now, while older rows hold
+newline-joined text. These tests save a run into a temporary database
+(never the real github.db) and check both formats read back as lists.
+"""
+
+import os
+import tempfile
+import unittest
+
+import db_utils
+from db_utils import (
+    _text_to_list,
+    create_run,
+    get_run_repo_scores_df,
+    reset_pool,
+    save_repo_scores,
+)
+
+
+class TestDbUtils(unittest.TestCase):
+    """
+    Validates the save/load round trip inside db_utils.py.
+    """
+
+    def setUp(self):
+        # Point the module at a fresh DB file; reset_pool() drops any
+        # connections (and the one-time setup) made for another path.
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old_path = db_utils.DB_PATH
+        reset_pool()
+        db_utils.DB_PATH = os.path.join(self._tmp.name, "test.db")
+
+    def tearDown(self):
+        reset_pool()
+        db_utils.DB_PATH = self._old_path
+        self._tmp.cleanup()
+
+    def test_save_repo_scores_round_trip(self):
+        """
+        Lists saved with save_repo_scores() come back from
+        get_run_repo_scores_df() as the same lists, best score first.
+        Items with commas, quotes, newlines or a leading "[" must survive.
+        """
+        rows = [
+            {
+                "repo": "low",
+                "url": "https://github.com/u/low",
+                "language": "Python",
+                "total_score": 40.0,
+                "strengths": [],
+                "weaknesses": ["no tests"],
+                "notes": "",
+            },
+            {
+                "repo": "high",
+                "url": "https://github.com/u/high",
+                "language": "Go",
+                "total_score": 90.5,
+                "strengths": ["clear README, good docs", 'says "hi"', "[WIP] module"],
+                "weaknesses": ["line one\nline two"],
+                "notes": "ok",
+            },
+        ]
+
+        run_id = create_run("u", repo_count=2)
+        save_repo_scores(run_id, iter(rows))
+
+        df = get_run_repo_scores_df(run_id)
+
+        self.assertEqual(df["repo"].tolist(), ["high", "low"])
+        self.assertEqual(df["Link"].tolist(), ["https://github.com/u/high", "https://github.com/u/low"])
+        self.assertEqual(df["strengths"].tolist(), [rows[1]["strengths"], []])
+        self.assertEqual(df["weaknesses"].tolist(), [rows[1]["weaknesses"], ["no tests"]])
+
+    def test_text_to_list_legacy_rows(self):
+        """
+        Rows saved by older versions are newline-joined text. One that happens
+        to start with "[" must still be split on lines, not read as JSON.
+        """
+        self.assertEqual(_text_to_list("[WIP] foo\nbar"), ["[WIP] foo", "bar"])
+        self.assertEqual(_text_to_list("[1] first"), ["[1] first"])
+        self.assertEqual(_text_to_list("a\nb"), ["a", "b"])
+        self.assertEqual(_text_to_list('["a","b"]'), ["a", "b"])
+        self.assertEqual(_text_to_list(""), [])
+        self.assertEqual(_text_to_list(None), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+test_file_utils.py
+
+This file contains unit tests for the file_utils module.
+
+These tests check the CSV that save_repos_csv writes for one column,
+several columns, generator input, rows missing a key and rows with an
+unexpected key.
+Files go to a temporary folder, not the real reports/ folder.
+"""
+
+import csv
+import os
+import tempfile
+import unittest
+
+import file_utils
+from file_utils import save_repos_csv
+
+
+class TestSaveReposCsv(unittest.TestCase):
+    """
+    Validates save_repos_csv() inside file_utils.py.
+    """
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old_dir = file_utils.REPORTS_DIR
+        file_utils.REPORTS_DIR = self._tmp.name
+
+    def tearDown(self):
+        file_utils.REPORTS_DIR = self._old_dir
+        self._tmp.cleanup()
+
+    def _read(self, path):
+        # Read the CSV back as a list of lists (header first)
+        with open(path, newline="", encoding="utf-8") as f:
+            return list(csv.reader(f))
+
+    def test_one_column(self):
+        """
+        Each row is written as one cell, not split into characters.
+        """
+        path = save_repos_csv("u", [{"name": "alpha"}, {"name": "b"}], ts="t1")
+        self.assertEqual(self._read(path), [["name"], ["alpha"], ["b"]])
+
+    def test_multiple_columns(self):
+        """
+        Values are written in the first row's key order, including commas and None.
+        """
+        rows = [
+            {"name": "a", "stars": 3, "desc": "x, y"},
+            {"name": "b", "stars": 0, "desc": None},
+        ]
+        path = save_repos_csv("u", rows, ts="t2")
+        self.assertEqual(
+            self._read(path),
+            [["name", "stars", "desc"], ["a", "3", "x, y"], ["b", "0", ""]],
+        )
+
+    def test_generator_input(self):
+        """
+        A generator works too (the first row is read for the headers, then put back).
+        """
+        rows = ({"name": n, "stars": i} for i, n in enumerate(["a", "b", "c"]))
+        path = save_repos_csv("u", rows, ts="t3")
+        self.assertEqual(
+            self._read(path),
+            [["name", "stars"], ["a", "0"], ["b", "1"], ["c", "2"]],
+        )
+
+    def test_missing_key_and_empty(self):
+        """
+        A row missing a column gets a blank cell (like csv.DictWriter),
+        and no rows at all still creates an empty file.
+        """
+        path = save_repos_csv("u", [{"name": "a", "stars": 1}, {"name": "b"}], ts="t4")
+        self.assertEqual(self._read(path), [["name", "stars"], ["a", "1"], ["b", ""]])
+
+        path = save_repos_csv("u", [], ts="t5")
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(self._read(path), [])
+
+    def test_unexpected_key_raises(self):
+        """
+        A row with a key that isn't in the header raises ValueError (like
+        csv.DictWriter's default), instead of quietly dropping that value.
+        """
+        with self.assertRaises(ValueError):
+            save_repos_csv("u", [{"name": "a"}, {"name": "b", "stars": 2}], ts="t6")
+
+
+if __name__ == "__main__":
+    unittest.main()
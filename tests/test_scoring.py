@@ -0,0 +1,69 @@
+"""
+test_scoring.py
+
+This file contains unit tests for the scoring module.
+
+The app scores a whole batch with score_many() and blend_scores(), while
+single repos still go through combined_repo_score(). Both paths must give
+the same numbers, so these tests compare them on edge-case rows.
+"""
+
+import unittest
+import numpy as np
+from scoring import (
+    HARD_SCORE_KEYS,
+    activity_score,
+    activity_score_vec,
+    blend_scores,
+    combined_repo_score,
+    score_many,
+)
+
+
+ROWS = [
+    {"days_since_push": 0, "stargazers_count": 0, "forks_count": 0, "open_issues_count": 0, "archived": False},
+    {"days_since_push": 7, "stargazers_count": 3, "forks_count": 1, "open_issues_count": 2, "archived": False},
+    {"days_since_push": 8, "stargazers_count": 250, "forks_count": 40, "open_issues_count": 30, "archived": True},
+    {"days_since_push": 365, "stargazers_count": None, "forks_count": None, "open_issues_count": None, "archived": None},
+    {"days_since_push": 400, "stargazers_count": 100000, "forks_count": 5000, "open_issues_count": 1, "archived": False},
+    {"days_since_push": None, "stargazers_count": -5, "forks_count": 2, "open_issues_count": -1, "archived": False},
+]
+
+
+class TestScoring(unittest.TestCase):
+    """
+    Validates the batch scoring helpers inside scoring.py.
+    """
+
+    def test_score_many_matches_combined_repo_score(self):
+        """
+        Each score_many() row, rounded the same way, must equal the
+        single-repo combined_repo_score() output (with and without an LLM score).
+        """
+        parts = score_many(ROWS)
+        self.assertEqual(parts.shape, (len(ROWS), len(HARD_SCORE_KEYS)))
+
+        for row, (a, p, h, hard) in zip(ROWS, parts.tolist()):
+            for llm in (None, 72, 150):
+                expected = combined_repo_score(row, llm_skill_score=llm)
+                self.assertEqual(blend_scores(a, p, h, llm), expected)
+            self.assertEqual(round(hard, 1), combined_repo_score(row)["hard_score"])
+
+    def test_score_many_empty(self):
+        """
+        No repos gives an empty (0, 4) array instead of an error.
+        """
+        self.assertEqual(score_many([]).shape, (0, len(HARD_SCORE_KEYS)))
+
+    def test_activity_score_vec_matches_scalar(self):
+        """
+        The sorted-lookup version must hit the same thresholds as activity_score(),
+        including the exact edges and a missing date (NaN -> 0).
+        """
+        days = [0, 7, 8, 30, 31, 90, 91, 365, 366, None]
+        vec = activity_score_vec(np.array([np.nan if d is None else d for d in days], dtype=np.float64))
+        self.assertEqual(vec.tolist(), [activity_score(d) for d in days])
+
+
+if __name__ == "__main__":
+    unittest.main()